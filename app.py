@@ -1,29 +1,54 @@
 import streamlit as st
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 from urllib.parse import urljoin
-from datetime import datetime
+from datetime import datetime, timedelta
 import time
 import concurrent.futures
+import asyncio
+import threading
+import json
 from urllib.parse import urlparse, urljoin
-import urllib.robotparser as urobot
 from hashlib import md5
+from collections import namedtuple
 from streamlit_autorefresh import st_autorefresh
 from ui.styles import load_css, aplicar_tema
+from utils.http_client import (
+    HEADERS,
+    MAX_DESCUBRIMIENTO_POR_HOST,
+    cabeceras_condicionales,
+    descargar_html,
+    limite_por_host,
+    obtener_sesion,
+)
+from utils.robots_cache import robots_cache
+from utils.crawl_async import ClienteAsync, RespuestaAsync
+from utils.codificacion import encoding_de_respuesta
+from utils.extraccion import crear_soup, parsear_articulo
+from utils.datos_estructurados import estadisticas_estructurados
+from utils.plantillas import plantillas_extraccion
+from utils.pipeline_parseo import FALLO_POOL, ContadoresEtapas, pipeline_parseo
+from utils.cache_html import cache_html
+from utils.canonical import canonica_declarada, canonizar, clave_fuente, host_base
+from utils.sitemap_stream import leer_sitemap_remoto, parse_fecha_w3c
+from utils.frontera import FronteraFrescura, parse_fecha
+from utils.rate_limiter import limitador_para
 from db.mysql_io import (
     crear_tablas,
     cargar_noticias,
+    buscar_en_contenido,
     guardar_en_mysql,
     registrar_lectura,
 )
+from db.indice_urls import indice_urls
+from db.crawl_memoria import cargar_memoria, guardar_memoria
+from db.validadores_http import cargar_validador, guardar_validador
+from db import frontera_crawl
 from urllib.parse import urlencode
 import os
 import sys
 import components.cards as cards
 from pathlib import Path
-from datetime import timezone
-from email.utils import parsedate_to_datetime
 
 # Asegura que el directorio del archivo esté en sys.path
 BASE_DIR = Path(__file__).resolve().parent
@@ -105,111 +130,13 @@ def init_session_state():
     if 'confirmar_reset' not in st.session_state:
         st.session_state.confirmar_reset = False
 
-def extraer_titulo(soup):
-    """Extraer título LIMPIO (sin HTML)"""
-    selectors = [
-        "h1",
-        ".entry-title",
-        ".post-title", 
-        "[class*='title']",
-        "title"
-    ]
-    
-    for selector in selectors:
-        element = soup.select_one(selector)
-        if element:
-            # USAR get_text() para obtener solo texto, sin HTML
-            title = element.get_text(strip=True)
-            if len(title) > 10:
-                return title
-    return None
-
-def _parse_datetime(s):
-    try:
-        # RFC2822
-        dt = parsedate_to_datetime(s)
-        return dt.astimezone(timezone.utc).isoformat()
-    except:
-        pass
-    # otros intentos simples...
-    try:
-        return pd.to_datetime(s, errors="coerce", utc=True).isoformat()
-    except:
-        return None
+# Segundos que se reutiliza el resultado de una búsqueda en el cuerpo de las noticias
+TTL_BUSQUEDA_SEG = 120
 
-def extraer_fecha(soup):
-    # <time> con datetime
-    time_elem = soup.find("time")
-    if time_elem:
-        v = time_elem.get("datetime") or time_elem.get_text(strip=True)
-        dt = _parse_datetime(v)
-        if dt: return dt
-    # og/article metas
-    for sel in [
-        ("meta", {"property":"article:published_time"}),
-        ("meta", {"name":"article:published_time"}),
-        ("meta", {"name":"pubdate"}),
-        ("meta", {"name":"date"}),
-        ("meta", {"itemprop":"datePublished"}),
-    ]:
-        m = soup.find(*sel)
-        if m and m.get("content"):
-            dt = _parse_datetime(m["content"])
-            if dt: return dt
-    # fallback: now UTC
-    return datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
-
-def extraer_categoria(soup):
-    """Extraer categoría"""
-    cat_link = soup.find("a", {"rel": "category tag"})
-    if cat_link:
-        return cat_link.get_text(strip=True)
-    
-    cat_classes = [".category", ".tag", "[class*='cat']"]
-    for cls in cat_classes:
-        elem = soup.select_one(cls)
-        if elem:
-            return elem.get_text(strip=True)
-    
-    return "General"
-
-def extraer_contenido(soup):
-    """Extraer contenido del artículo"""
-    article = soup.find("article")
-    if article:
-        paragraphs = article.find_all("p")
-        content = " ".join([p.get_text(strip=True) for p in paragraphs])
-        if len(content) > 50:
-            return content
-    
-    content_selectors = [".entry-content", ".post-content", ".article-content", ".content"]
-    for selector in content_selectors:
-        elem = soup.select_one(selector)
-        if elem:
-            paragraphs = elem.find_all("p")
-            content = " ".join([p.get_text(strip=True) for p in paragraphs])
-            if len(content) > 50:
-                return content
-    
-    paragraphs = soup.find_all("p")
-    return " ".join([p.get_text(strip=True) for p in paragraphs[:10]])
-
-def extraer_imagen(soup, base_url):
-    img_selectors = ["img.wp-post-image",".featured-image img",".post-thumbnail img","article img:first-of-type"]
-    for selector in img_selectors:
-        img = soup.select_one(selector)
-        if img and img.get("src"):
-            return urljoin(base_url, img["src"])
-    for meta_name in [
-        ("meta", {"property":"og:image"}),
-        ("meta", {"name":"og:image"}),
-        ("meta", {"name":"twitter:image"}),
-        ("meta", {"property":"twitter:image"}),
-    ]:
-        m = soup.find(*meta_name)
-        if m and m.get("content"):
-            return urljoin(base_url, m["content"])
-    return None
+@st.cache_data(ttl=TTL_BUSQUEDA_SEG, show_spinner=False)
+def _ids_con_texto(busqueda):
+    """Ids cuyo cuerpo contiene el texto; cacheado: cada rerun con la misma búsqueda no vuelve a recorrer SCRAP"""
+    return buscar_en_contenido(busqueda)
 
 def filtrar_noticias(df, categoria, busqueda):
     """Filtrar noticias mejorado"""
@@ -220,14 +147,28 @@ def filtrar_noticias(df, categoria, busqueda):
         df = df[df['categoria'].str.contains(categoria, case=False, na=False)]
     
     if busqueda:
+        # El cuerpo no viaja en la fila del listado: se busca en la base
         df = df[
             df['titulo'].str.contains(busqueda, case=False, na=False) | 
-            df['contenido'].str.contains(busqueda, case=False, na=False) |
+            df['id'].isin(_ids_con_texto(busqueda.strip().lower())) |
             df['categoria'].str.contains(busqueda, case=False, na=False)
         ]
     
     return df
 
+def agrupar_historias(df):
+    """Una tarjeta por historia: la versión más reciente, con cuántas fuentes distintas la publicaron"""
+    if df.empty or 'historia_id' not in df.columns:
+        return df
+    historia = df['historia_id'].fillna(df['id']).astype(int)
+    # Filas sin migrar (fuente NULL): la fuente sale de la URL
+    fuente = df['fuente'].copy()
+    sin_fuente = fuente.isna()
+    fuente[sin_fuente] = df.loc[sin_fuente, 'url_original'].map(clave_fuente)
+    fuentes = fuente.groupby(historia).transform('nunique').clip(lower=1)
+    df = df.assign(fuentes_historia=fuentes)
+    return df[~historia.duplicated()]
+
 # Diccionario de fuentes disponibles
 fuentes_disponibles = {
     "Diario Sin Fronteras": "https://diariosinfronteras.com.pe/",
@@ -278,26 +219,22 @@ PATTERNS_POR_MEDIO = {
 
 RSS_CANDIDATOS = ["rss", "feed", "feeds", "rss.xml", "feed.xml", "rss2.xml", "index.xml"]
 
+# Cada cuántos días se vuelven a probar todos los feeds/esquemas de paginación de un dominio
+RESONDEO_DIAS = 7
+# Un crawl cortado hace menos de esto se reanuda desde la frontera persistente, sin volver a descubrir
+REANUDAR_MIN = 30
+# Margen sobre el último crawl completo al filtrar por <lastmod> (hay sitemaps que solo ponen la fecha)
+MARGEN_LASTMOD = timedelta(days=1)
+
 EXTENSIONES_PROHIBIDAS = (
     ".jpg",".jpeg",".png",".gif",".webp",".svg",
     ".pdf",".doc",".docx",".xls",".xlsx",".ppt",".pptx",".zip",".rar"
 )
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept-Language": "es-PE,es;q=0.9,en;q=0.8"
-}
-
 def es_permitido_por_robots(base, path):
-    try:
-        p = urlparse(base)
-        robots_url = f"{p.scheme}://{p.netloc}/robots.txt"
-        rp = urobot.RobotFileParser()
-        rp.set_url(robots_url)
-        rp.read()
-        return rp.can_fetch(HEADERS["User-Agent"], urljoin(base, path))
-    except:
-        return True  # si falla robots, seguimos con cautela
+    # robots.txt se descarga una vez por host y se cachea (ver utils/robots_cache.py);
+    # si falla robots, seguimos con cautela
+    return robots_cache.permitido(urljoin(base, path), HEADERS["User-Agent"])
 
 def normaliza_url(base, href):
     if not href:
@@ -308,7 +245,8 @@ def normaliza_url(base, href):
     full = urljoin(base, href)
     u = urlparse(full)
     clean = u._replace(fragment="", query="").geturl()
-    return clean
+    # Misma nota bajo AMP, host móvil o http: se baja siempre la forma canónica
+    return canonizar(clean, base)
 
 def parece_articulo(url):
     u = urlparse(url)
@@ -326,36 +264,207 @@ def parece_articulo(url):
         return True
     return False
 
-def descubre_desde_rss(base_url):
-    urls = set()
-    for r in RSS_CANDIDATOS:
-        rss_url = urljoin(base_url, f"/{r}")
-        try:
-            resp = requests.get(rss_url, headers=HEADERS, timeout=10)
-            if resp.status_code == 200 and ("<rss" in resp.text or "<feed" in resp.text):
-                soup = BeautifulSoup(resp.text, "xml")
-                for item in soup.find_all(["item","entry"]):
-                    link = item.find("link")
-                    href = link.get("href") if link and link.has_attr("href") else (link.get_text(strip=True) if link else None)
-                    u = normaliza_url(base_url, href)
-                    if u:
-                        urls.add(u)
-        except:
+def _links_de_feed(contenido, base_url):
+    """Links de los <item>/<entry> de un RSS o Atom (bytes: el parser XML lee el encoding de la declaración)"""
+    urls = FronteraFrescura()
+    soup = BeautifulSoup(contenido, "xml")
+    for item in soup.find_all(["item","entry"]):
+        link = item.find("link")
+        href = link.get("href") if link and link.has_attr("href") else (link.get_text(strip=True) if link else None)
+        u = normaliza_url(base_url, href)
+        if u:
+            fecha = item.find(["pubDate", "published", "updated", "date"])
+            urls.agregar(u, fecha=parse_fecha(fecha.get_text(strip=True)) if fecha else None, origen="rss")
+    return urls
+
+def _links_de_html(contenido, base_url, max_links=None, pagina=1, encoding=None):
+    """Links con pinta de artículo dentro de una página HTML (bytes + encoding), con su posición en la página"""
+    urls = FronteraFrescura()
+    soup = crear_soup(contenido, encoding)
+    for a in soup.find_all("a", href=True):
+        u = normaliza_url(base_url, a["href"])
+        if u and parece_articulo(u) and u not in urls:
+            urls.agregar(u, pagina=pagina, posicion=len(urls), origen="portada" if pagina == 1 else "paginacion")
+        if max_links and len(urls) >= max_links:
+            break
+    return urls
+
+def _es_feed(status, contenido):
+    return status == 200 and (b"<rss" in contenido or b"<feed" in contenido)
+
+def _es_pagina_listado(status, contenido):
+    return status == 200 and len(contenido) > 2000
+
+# Extractores de enlaces para _descubrir_condicional: reciben una RespuestaAsync
+# (también en el motor de hilos) y devuelven una FronteraFrescura o None
+def _extraer_feed(base_url):
+    return lambda r: _links_de_feed(r.contenido, base_url) if _es_feed(r.status, r.contenido) else None
+
+def _extraer_portada(base_url, max_links):
+    def _extraer(r):
+        if r.status != 200:
+            return None
+        return _links_de_html(r.contenido, base_url, max_links,
+                              encoding=encoding_de_respuesta(base_url, r.contenido, r.headers))
+    return _extraer
+
+def _extraer_listado(base_url, pagina):
+    def _extraer(r):
+        if not _es_pagina_listado(r.status, r.contenido):
+            return None
+        return _links_de_html(r.contenido, base_url, pagina=pagina,
+                              encoding=encoding_de_respuesta(base_url, r.contenido, r.headers))
+    return _extraer
+
+ESQUEMAS_PAGINACION = {
+    "page": lambda base_url, i: urljoin(base_url, f"/page/{i}/"),
+    "pagina": lambda base_url, i: urljoin(base_url, f"/pagina/{i}/"),
+    "query": lambda base_url, i: _with_query(base_url, page=i),
+}
+
+def _dominio(url):
+    # Misma clave por dominio que plantillas, estadísticas y frontera (solo quita el prefijo espejo)
+    return host_base(urlparse(url).netloc)
+
+def _necesita_sondeo(fecha):
+    return not fecha or datetime.now() - fecha > timedelta(days=RESONDEO_DIAS)
+
+def _plan_rss(base_url, forzar_sondeo=False):
+    """Devuelve (candidatos, sondeo_completo): solo el feed aprendido salvo que toque re-sondear"""
+    memoria = cargar_memoria(_dominio(base_url))
+    if not forzar_sondeo and memoria.get("feed_path") is not None and not _necesita_sondeo(memoria.get("sondeo_rss_en")):
+        # feed_path vacío: el dominio no publica feed, no se prueba nada
+        return ([memoria["feed_path"]] if memoria["feed_path"] else []), False
+    return list(RSS_CANDIDATOS), True
+
+def _aprender_rss(base_url, funcionaron, sondeo_completo):
+    """Guarda el primer candidato que devolvió un feed ("" si ninguno)"""
+    if sondeo_completo:
+        feed = next((c for c in RSS_CANDIDATOS if c in funcionaron), "")
+        guardar_memoria(_dominio(base_url), feed_path=feed, sondeo_rss_en=datetime.now())
+
+def _plan_paginacion(base_url, max_pages, forzar_sondeo=False):
+    """
+    Devuelve (plan, sondeo_completo) con plan = [(esquema, pagina, url)].
+    Con un esquema aprendido se pide solo ese, hasta una página más que la
+    última que aportó enlaces nuevos.
+    """
+    memoria = cargar_memoria(_dominio(base_url))
+    esquema = memoria.get("esquema_paginacion")
+    if not forzar_sondeo and esquema is not None and not _necesita_sondeo(memoria.get("sondeo_paginacion_en")):
+        if esquema not in ESQUEMAS_PAGINACION:
+            return [], False
+        hasta = min(max_pages, (memoria.get("ultima_pagina_util") or max_pages) + 1)
+        return [(esquema, i, ESQUEMAS_PAGINACION[esquema](base_url, i)) for i in range(2, hasta+1)], False
+    plan = [(e, i, f(base_url, i)) for i in range(2, max_pages+1) for e, f in ESQUEMAS_PAGINACION.items()]
+    return plan, True
+
+def _aprender_paginacion(base_url, links_por_pagina, sondeo_completo):
+    """
+    links_por_pagina: {(esquema, pagina): urls} de las páginas que respondieron.
+    Se queda con el esquema que más enlaces aportó y con la última página que
+    todavía trajo enlaces nuevos respecto de las anteriores.
+    """
+    mejor, mejor_total, ultima = "", 0, None
+    for esquema in ESQUEMAS_PAGINACION:
+        paginas = sorted(p for e, p in links_por_pagina if e == esquema)
+        if len(paginas) > 1 and all(set(links_por_pagina[(esquema, p)]) == set(links_por_pagina[(esquema, paginas[0])]) for p in paginas):
+            # Todas las páginas devuelven lo mismo: el sitio ignora el parámetro
             continue
+        vistos, ultima_util = set(), None
+        for pagina in paginas:
+            nuevos = set(links_por_pagina[(esquema, pagina)]) - vistos
+            if nuevos:
+                ultima_util = pagina
+                vistos |= nuevos
+        if len(vistos) > mejor_total:
+            mejor, mejor_total, ultima = esquema, len(vistos), ultima_util
+
+    dominio = _dominio(base_url)
+    if sondeo_completo:
+        guardar_memoria(dominio, esquema_paginacion=mejor, ultima_pagina_util=ultima,
+                        sondeo_paginacion_en=datetime.now())
+    elif mejor:
+        guardar_memoria(dominio, ultima_pagina_util=ultima)
+
+def _agregar_locs(urls, entradas, base_url, max_items):
+    """entradas: [(loc, fecha)] de un sitemap"""
+    for loc, fecha in entradas:
+        u = normaliza_url(base_url, loc)
+        if u and parece_articulo(u):
+            urls.agregar(u, fecha=fecha, origen="sitemap")
+        if len(urls) >= max_items:
+            break
+
+def _get_acotado(url, timeout, headers=None):
+    """GET con la sesión compartida, limitado por host"""
+    with limite_por_host(url):
+        return obtener_sesion().get(url, timeout=timeout, headers=headers)
+
+def _enlaces_condicionales(url, validador, status, headers, extraer):
+    """
+    Resuelve la respuesta de un GET condicional de descubrimiento:
+    - 304: el recurso no cambió, se reutilizan los enlaces guardados en el crawl anterior
+    - otro: extraer() saca los enlaces (None si la respuesta no sirve) y se guardan
+      junto con el ETag / Last-Modified nuevos
+    """
+    if status == 304 and validador:
+        return FronteraFrescura.desde_lista(validador["enlaces"])
+    urls = extraer()
+    if urls is not None:
+        guardar_validador(url, headers.get("ETag"), headers.get("Last-Modified"), urls.a_lista())
+    return urls
+
+def _descubrir_condicional(url, timeout, extraer):
+    """GET con If-None-Match / If-Modified-Since; extraer(RespuestaAsync) devuelve una FronteraFrescura o None"""
+    validador = cargar_validador(url)
+    r = _get_acotado(url, timeout, cabeceras_condicionales(validador))
+    r = RespuestaAsync(r.status_code, r.url, r.content, r.headers)
+    return _enlaces_condicionales(url, validador, r.status, r.headers, lambda: extraer(r))
+
+def _en_paralelo(funcion, items, max_workers=MAX_DESCUBRIMIENTO_POR_HOST):
+    """Aplica funcion a cada item en paralelo y entrega (item, resultado) según terminan; los errores se descartan"""
+    items = list(items)
+    if not items:
+        return
+    ex = concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(items)))
+    try:
+        futs = {ex.submit(funcion, it): it for it in items}
+        for fut in concurrent.futures.as_completed(futs):
+            try:
+                res = fut.result()
+            except Exception:
+                continue
+            yield futs[fut], res
+    finally:
+        # Si el consumidor corta antes (p.ej. max_items), no se esperan los pendientes
+        ex.shutdown(wait=False, cancel_futures=True)
+
+def _probar_feeds(base_url, candidatos):
+    """Devuelve (urls, candidatos que respondieron con un feed)"""
+    urls, funcionaron = FronteraFrescura(), set()
+    por_url = {urljoin(base_url, f"/{c}"): c for c in candidatos}
+    extraer = _extraer_feed(base_url)
+    for rss_url, parte in _en_paralelo(lambda u: _descubrir_condicional(u, 10, extraer), por_url):
+        if parte is not None:
+            urls |= parte
+            funcionaron.add(por_url[rss_url])
+    return urls, funcionaron
+
+def descubre_desde_rss(base_url):
+    candidatos, completo = _plan_rss(base_url)
+    urls, funcionaron = _probar_feeds(base_url, candidatos)
+    if candidatos and not funcionaron and not completo:
+        # El feed aprendido dejó de responder: se vuelven a probar todos
+        candidatos, completo = _plan_rss(base_url, forzar_sondeo=True)
+        urls, funcionaron = _probar_feeds(base_url, candidatos)
+    _aprender_rss(base_url, funcionaron, completo)
     return urls
 
 def descubre_desde_home(base_url, max_links=400):
-    urls = set()
+    urls = FronteraFrescura()
     try:
-        resp = requests.get(base_url, headers=HEADERS, timeout=15)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        for a in soup.find_all("a", href=True):
-            u = normaliza_url(base_url, a["href"])
-            if u and parece_articulo(u):
-                urls.add(u)
-            if len(urls) >= max_links:
-                break
+        urls = _descubrir_condicional(base_url, 15, _extraer_portada(base_url, max_links)) or urls
     except:
         pass
     return urls
@@ -366,180 +475,619 @@ def _with_query(url, **params):
     q.update(params)
     return u._replace(query=urlencode(q)).geturl()
 
+def _probar_paginacion(base_url, plan):
+    """Devuelve {(esquema, pagina): urls} de las páginas de listado que respondieron"""
+    links = {}
+    por_url = {url: (esquema, pagina) for esquema, pagina, url in plan}
+
+    def _probar(url):
+        return _descubrir_condicional(url, 10, _extraer_listado(base_url, por_url[url][1]))
+
+    for url, parte in _en_paralelo(_probar, por_url):
+        if parte is not None:
+            links[por_url[url]] = parte
+    return links
+
 def descubre_paginacion(base_url, max_pages=12):
-    urls = set()
-    for i in range(2, max_pages+1):
-        candidates = [
-            urljoin(base_url, f"/page/{i}/"),
-            urljoin(base_url, f"/pagina/{i}/"),
-            _with_query(base_url, page=i),
-        ]
-        for url in candidates:
-            try:
-                r = requests.get(url, headers=HEADERS, timeout=10)
-                if r.status_code == 200 and len(r.text) > 2000:
-                    soup = BeautifulSoup(r.text, "html.parser")
-                    for a in soup.find_all("a", href=True):
-                        u = normaliza_url(base_url, a["href"])
-                        if u and parece_articulo(u):
-                            urls.add(u)
-            except:
-                continue
-    return urls
+    plan, completo = _plan_paginacion(base_url, max_pages)
+    links = _probar_paginacion(base_url, plan)
+    if plan and not links and not completo:
+        # El esquema aprendido dejó de funcionar: se vuelven a probar todos
+        plan, completo = _plan_paginacion(base_url, max_pages, forzar_sondeo=True)
+        links = _probar_paginacion(base_url, plan)
+    _aprender_paginacion(base_url, links, completo)
+    return FronteraFrescura.union(links.values())
+
+def _fecha_desde(base_url):
+    """Las entradas de sitemap anteriores al último crawl completo del dominio se omiten"""
+    ultimo = cargar_memoria(_dominio(base_url)).get("ultimo_crawl_ok")
+    return (ultimo - MARGEN_LASTMOD).astimezone() if ultimo else None
+
+def _leer_sitemap(sitemap_url, base_url, desde, max_items):
+    """
+    Sitemap en streaming, limitado por host y condicional; devuelve (es_indice, [(loc, fecha)]).
+    Si el sitemap no cambió (304) se reutilizan las entradas del crawl anterior.
+    """
+    def _aceptar(loc):
+        u = normaliza_url(base_url, loc)
+        return bool(u) and parece_articulo(u)
+    validador = cargar_validador(sitemap_url)
+    with limite_por_host(sitemap_url):
+        lectura = leer_sitemap_remoto(sitemap_url, obtener_sesion(), timeout=15, desde=desde,
+                                      aceptar=_aceptar, limite=max_items,
+                                      cabeceras=cabeceras_condicionales(validador))
+    if lectura.status == 304 and validador:
+        guardado = validador["enlaces"]
+        entradas = [(loc, parse_fecha_w3c(fecha)) for loc, fecha in guardado["entradas"]]
+        return guardado["es_indice"], [(loc, f) for loc, f in entradas if not (desde and f and f < desde)]
+    if lectura.status == 200:
+        guardar_validador(sitemap_url, lectura.headers.get("ETag"), lectura.headers.get("Last-Modified"), {
+            "es_indice": lectura.es_indice,
+            "entradas": [[loc, f.isoformat() if f else None] for loc, f in lectura.entradas],
+        })
+    return lectura.es_indice, lectura.entradas
 
 def descubre_desde_sitemap(base_url, max_items=600):
-    urls = set()
+    urls = FronteraFrescura()
     try:
         u = urlparse(base_url)
         sitemap_url = f"{u.scheme}://{u.netloc}/sitemap.xml"
-        r = requests.get(sitemap_url, headers=HEADERS, timeout=15)
-        if r.status_code == 200:
-            soup = BeautifulSoup(r.text, "xml")
-            if soup.find("sitemapindex"):
-                for sm in soup.find_all("sitemap"):
-                    loc = sm.find("loc")
-                    if not loc: 
-                        continue
-                    sm_url = loc.get_text(strip=True)
-                    try:
-                        r2 = requests.get(sm_url, headers=HEADERS, timeout=15)
-                        if r2.status_code == 200:
-                            soup2 = BeautifulSoup(r2.text, "xml")
-                            for loc2 in soup2.find_all("loc"):
-                                u3 = normaliza_url(base_url, loc2.get_text(strip=True))
-                                if u3 and parece_articulo(u3):
-                                    urls.add(u3)
-                                if len(urls) >= max_items:
-                                    return urls
-                    except:
-                        continue
-            else:
-                for loc in soup.find_all("loc"):
-                    u2 = normaliza_url(base_url, loc.get_text(strip=True))
-                    if u2 and parece_articulo(u2):
-                        urls.add(u2)
-                    if len(urls) >= max_items:
-                        break
+        desde = _fecha_desde(base_url)
+        es_indice, entradas = _leer_sitemap(sitemap_url, base_url, desde, max_items)
+        if not es_indice:
+            _agregar_locs(urls, entradas, base_url, max_items)
+            return urls
+        # Sitemaps hijos en paralelo, los más recientes primero; los que no cambiaron
+        # desde el último crawl ya vienen descartados por su <lastmod>
+        entradas.sort(key=lambda e: e[1].timestamp() if e[1] else 0, reverse=True)
+        hijos = [loc for loc, _ in entradas]
+        for _, (_, entradas_hijo) in _en_paralelo(lambda sm: _leer_sitemap(sm, base_url, desde, max_items), hijos):
+            _agregar_locs(urls, entradas_hijo, base_url, max_items)
+            if len(urls) >= max_items:
+                break
     except:
         pass
     return urls
 
-def extrae_mejor_texto(soup):
-    """Extrae contenido LIMPIO (sin HTML)"""
-    # PRIMERO: Intentar con article
-    article = soup.find("article")
-    if article:
-        # USAR get_text() para obtener solo texto
-        txt = article.get_text(" ", strip=True)
-        if len(txt) > 200:
-            return txt
-    
-    # SEGUNDO: Buscar en contenedores de contenido
-    for sel in [".entry-content", ".post-content", ".article-content", ".content", "#content"]:
-        box = soup.select_one(sel)
-        if box:
-            # USAR get_text() para obtener solo texto
-            txt = box.get_text(" ", strip=True)
-            if len(txt) > 200:
-                return txt
-    
-    # TERCERO: Todos los párrafos
-    ps = soup.find_all("p")
-    if ps:
-        # USAR get_text() en cada párrafo
-        txt = " ".join(p.get_text(" ", strip=True) for p in ps[:10])
-        if len(txt) > 150:
-            return txt
-    
-    # ÚLTIMO: Todo el body como fallback (SOLO TEXTO)
-    return soup.get_text(" ", strip=True)[:1000]
+ETAPAS_DESCUBRIMIENTO = {
+    "rss": "🔎 RSS",
+    "portada": "🏠 Portada",
+    "paginacion": "🧭 Paginación",
+    "sitemap": "🗺️ Sitemap",
+}
 
-def fetch_articulo(url, base_url):
-    try:
-        if not es_permitido_por_robots(base_url, urlparse(url).path):
-            return None
+def descubrir_urls(base_url, max_links=600, max_pages=12, progress_callback=None):
+    """
+    Ejecuta las cuatro etapas de descubrimiento a la vez y une los resultados
+    según llegan. Devuelve (urls, tiempos) con los segundos de cada etapa.
+    """
+    etapas = {
+        "rss": lambda: descubre_desde_rss(base_url),
+        "portada": lambda: descubre_desde_home(base_url, max_links=max_links//2),
+        "paginacion": lambda: descubre_paginacion(base_url, max_pages=max_pages),
+        "sitemap": lambda: descubre_desde_sitemap(base_url, max_items=max_links),
+    }
 
-        for intento in range(3):
+    def _medir(nombre):
+        t0 = time.time()
+        return etapas[nombre](), time.time() - t0
+
+    urls, tiempos = FronteraFrescura(), {}
+    inicio = time.time()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(etapas)) as ex:
+        futs = {ex.submit(_medir, nombre): nombre for nombre in etapas}
+        for i, fut in enumerate(concurrent.futures.as_completed(futs), start=1):
+            nombre = futs[fut]
             try:
-                r = requests.get(url, headers=HEADERS, timeout=15)
-                if r.status_code in (429, 503):
-                    time.sleep(1.5 * (intento + 1))
-                    continue
-                r.raise_for_status()
-                break
-            except:
-                if intento == 2:
-                    return None
-                time.sleep(1.2 * (intento + 1))
+                parte, seg = fut.result()
+            except Exception:
+                parte, seg = FronteraFrescura(), time.time() - inicio
+            urls |= parte
+            tiempos[nombre] = round(seg, 2)
+            if progress_callback:
+                progress_callback(5 + int(i / len(etapas) * 50), f"{ETAPAS_DESCUBRIMIENTO[nombre]}: {len(parte)} enlaces…")
+    tiempos["total"] = round(time.time() - inicio, 2)
+    return urls, tiempos
 
-        soup = BeautifulSoup(r.text, "html.parser")
+def _log_tiempos(base_url, tiempos):
+    detalle = ", ".join(f"{k} {v}s" for k, v in tiempos.items())
+    print(f"[CRAWL] Descubrimiento {base_url}: {detalle}")
 
-        titulo = extraer_titulo(soup)
-        if not titulo or len(titulo) < 8:
-            return None
+def _log_estructurados(base_url):
+    print(f"[CRAWL] Datos estructurados {base_url}: {estadisticas_estructurados.resumen(_dominio(base_url))}")
 
-        contenido = extrae_mejor_texto(soup)
-        if not contenido or len(contenido) < 150:
-            return None
+def _anotar(registro, url, resultado, reintentar):
+    """Anota en la frontera persistente una descarga sin artículo (los válidos se marcan al guardarlos)"""
+    if registro is not None and resultado is None:
+        if reintentar:
+            registro.reintentar(url)
+        else:
+            registro.descartar(url)
 
-        fecha = extraer_fecha(soup)
-        categoria = extraer_categoria(soup)
-        imagen = extraer_imagen(soup, url)
+def _descargar_pagina(url, base_url, registro=None):
+    """
+    Etapa de red de fetch_articulo: la página descargada (DescargaHtml con contenido) o None.
+    Si no hay página se anota en registro si la URL se descarta o se reintenta en otro crawl.
+    """
+    pagina, reintentar = None, False
+    try:
+        if es_permitido_por_robots(base_url, urlparse(url).path):
+            # Limitador compartido por todos los workers del host (respeta Crawl-delay y Retry-After)
+            limitador = limitador_para(url, robots_cache.crawl_delay(url, HEADERS["User-Agent"]))
 
-        return (titulo.strip(), fecha or "", categoria or "General", contenido.strip(), imagen, url)
+            for intento in range(3):
+                limitador.adquirir()
+                try:
+                    # Streaming acotado: solo HTML (los binarios se descartan), hasta MAX_BYTES_PAGINA
+                    r = descargar_html(url, timeout=15)
+                except Exception:
+                    limitador.liberar(None)
+                    continue
+                limitador.liberar(r.status, r.headers.get("Retry-After"))
+                if r.status in (429, 503) or r.status >= 500:
+                    # El limitador ya pausó el host; el reintento espera su turno
+                    continue
+                if r.contenido is not None:
+                    # Copia cruda para poder re-extraer sin volver a descargar (reextraer.py)
+                    cache_html.guardar(url, r.contenido, r.encoding)
+                    indice_urls.registrar_canonica(url, canonica_declarada(r.contenido, url))
+                    pagina = r
+                break
+            else:
+                # Fallos de red / 5xx en todos los intentos: se vuelve a probar más adelante
+                reintentar = True
     except:
+        pass
+    if pagina is None:
+        _anotar(registro, url, None, reintentar)
+    return pagina
+
+def fetch_articulo(url, base_url, registro=None):
+    """
+    Descarga y parsea un artículo en el mismo hilo; None si no es válido.
+    registro: RegistroFrontera donde se anota si la URL se descarta o se reintenta en otro crawl.
+    """
+    pagina = _descargar_pagina(url, base_url, registro)
+    if pagina is None:
         return None
+    try:
+        resultado = parsear_articulo(pagina.contenido, url, pagina.encoding)
+    except:
+        resultado = None
+    _anotar(registro, url, resultado, False)
+    return resultado
 
-def scrapear_noticias_exhaustivo(base_url, progress_callback=None, max_links=600, max_pages=12, max_workers=10):
-    """Devuelve lista de tuplas (titulo, fecha, categoria, contenido, imagen, url)"""
-    urls = set()
+def _preparar_urls(urls, max_links):
+    """Ordena la frontera por frescura y recorta al presupuesto de enlaces (lo más nuevo primero)"""
+    urls = [u for u in urls.ordenadas() if u and not any(u.lower().endswith(ext) for ext in EXTENSIONES_PROHIBIDAS)]
+    # Las URLs ya guardadas en SCRAP no se vuelven a descargar
+    urls = indice_urls.filtrar_nuevas(urls)
+    if len(urls) > max_links:
+        urls = urls[:max_links]
+    return urls
 
-    if progress_callback: progress_callback(5, "🔎 RSS…")
-    urls |= descubre_desde_rss(base_url)
+def _cargar_plantilla(base_url):
+    """Selectores de extracción aprendidos para el dominio en crawls anteriores (ver utils/plantillas.py)"""
+    guardada = cargar_memoria(_dominio(base_url)).get("plantilla_extraccion")
+    if guardada:
+        try:
+            plantillas_extraccion.cargar(base_url, json.loads(guardada))
+        except ValueError:
+            pass
 
-    if progress_callback: progress_callback(15, "🏠 Portada…")
-    urls |= descubre_desde_home(base_url, max_links=max_links//2)
+def _marcar_crawl_ok(base_url, inicio, descubiertas):
+    """
+    Registra el inicio del último crawl completo (se usa para filtrar sitemaps por <lastmod>)
+    y la plantilla de extracción aprendida del dominio
+    """
+    campos = {"crawl_en_curso_desde": None}
+    if descubiertas:
+        campos["ultimo_crawl_ok"] = inicio
+    plantilla = plantillas_extraccion.exportar(base_url)
+    if plantilla:
+        campos["plantilla_extraccion"] = json.dumps(plantilla)
+    guardar_memoria(_dominio(base_url), **campos)
 
-    if progress_callback: progress_callback(35, "🧭 Paginación…")
-    urls |= descubre_paginacion(base_url, max_pages=max_pages)
+def _pendientes_nuevas(fuente, max_links):
+    """Pendientes de la frontera persistente que todavía no están en SCRAP; None sin base"""
+    urls = frontera_crawl.pendientes(fuente, max_links)
+    if urls is None:
+        return None
+    nuevas = indice_urls.filtrar_nuevas(urls)
+    # Guardadas en SCRAP después de encolarlas (otro proceso, o un crawl cortado antes de marcarlas)
+    vistas = set(nuevas)
+    frontera_crawl.marcar([u for u in urls if u not in vistas], "hecho")
+    return nuevas
 
-    if progress_callback: progress_callback(55, "🗺️ Sitemap…")
-    urls |= descubre_desde_sitemap(base_url, max_items=max_links)
+def _frontera_reanudable(base_url, max_links):
+    """
+    Si el último crawl de la fuente se cortó hace menos de REANUDAR_MIN, devuelve sus
+    pendientes para seguir donde quedó sin volver a descubrir; si no, None.
+    """
+    fuente = _dominio(base_url)
+    en_curso = cargar_memoria(fuente).get("crawl_en_curso_desde")
+    if not en_curso or datetime.now() - en_curso > timedelta(minutes=REANUDAR_MIN):
+        return None
+    return _pendientes_nuevas(fuente, max_links) or None
 
-    urls = [u for u in urls if u and not any(u.lower().endswith(ext) for ext in EXTENSIONES_PROHIBIDAS)]
-    urls = list(dict.fromkeys(urls))
-    if len(urls) > max_links:
-        urls = urls[:max_links]
+def _encolar_descubiertas(base_url, urls, max_links):
+    """
+    Guarda todo lo descubierto en la frontera persistente y devuelve lo que toca bajar:
+    las max_links pendientes más frescas, incluidas las que quedaron de crawls anteriores.
+    Sin base de datos se usa directamente lo descubierto.
+    """
+    candidatas = _preparar_urls(urls, len(urls))
+    fuente = _dominio(base_url)
+    if not frontera_crawl.encolar(fuente, [(u, urls.puntaje(u)) for u in candidatas]):
+        return candidatas[:max_links]
+    pendientes = _pendientes_nuevas(fuente, max_links)
+    if pendientes is None:
+        return candidatas[:max_links]
+    if pendientes:
+        # Si el crawl se corta a partir de aquí, el próximo sigue desde la frontera
+        guardar_memoria(fuente, crawl_en_curso_desde=datetime.now())
+    return pendientes
 
-    if not urls:
-        if progress_callback: progress_callback(100, "⚠️ No se hallaron artículos.")
-        return []
+# Página descargada cuyo parseo está en el pool de procesos (la página se guarda por si el pool falla)
+_EnParseo = namedtuple("_EnParseo", ["url", "futuro", "pagina"])
 
+def _descargar_articulos(urls, base_url, ex, max_en_vuelo, progress_callback=None, registro=None):
+    """
+    Pipeline de dos etapas:
+    - red: el pool de hilos ex descarga con como mucho max_en_vuelo a la vez
+      (el pool puede estar compartido con otras fuentes)
+    - parseo: cada página descargada pasa al pool de procesos (utils/pipeline_parseo.py);
+      si su cola está llena, el hilo de descarga espera antes de bajar la siguiente.
+      Si el pool falla, la página ya descargada se parsea en el pool de hilos
+    Devuelve las tuplas válidas.
+    """
     resultados, vistos_hash = [], set()
+    contadores = ContadoresEtapas()
 
     def _task(u):
         h = md5(u.encode("utf-8")).hexdigest()
         if h in vistos_hash:
             return None
         vistos_hash.add(h)
-        return fetch_articulo(u, base_url)
+        inicio = time.monotonic()
+        pagina = _descargar_pagina(u, base_url, registro)
+        contadores.descarga(time.monotonic() - inicio, len(pagina.contenido) if pagina else 0)
+        if pagina is None:
+            return None
+        futuro = pipeline_parseo.enviar(pagina.contenido, u, pagina.encoding, contadores)
+        if futuro is not None:
+            return _EnParseo(u, futuro, pagina)
+        # Sin pool de procesos: se parsea en el mismo hilo
+        return _parsear_en_hilo(u, pagina)
+
+    def _parsear_en_hilo(u, pagina):
+        resultado = pipeline_parseo.parsear_en_hilo(pagina.contenido, u, pagina.encoding, contadores)
+        _anotar(registro, u, resultado, False)
+        return resultado
+
+    total, hechos = len(urls), 0
+    pendientes, cola = set(), iter(urls)
+    descargas, parseos = set(), {}
+    while True:
+        # Solo se encolan max_en_vuelo descargas: así una fuente no acapara el pool compartido
+        while len(descargas) < max_en_vuelo:
+            u = next(cola, None)
+            if u is None:
+                break
+            fut = ex.submit(_task, u)
+            descargas.add(fut)
+            pendientes.add(fut)
+        if not pendientes:
+            break
+        listos, pendientes = concurrent.futures.wait(pendientes, return_when=concurrent.futures.FIRST_COMPLETED)
+        for fut in listos:
+            if fut in descargas:
+                descargas.discard(fut)
+                res = fut.result()
+                if isinstance(res, _EnParseo):
+                    # Descargada: pasa a la etapa de parseo
+                    parseos[res.futuro] = res
+                    pendientes.add(res.futuro)
+                    continue
+            else:
+                en_parseo = parseos.pop(fut)
+                res = pipeline_parseo.resultado(fut, en_parseo.url, contadores)
+                if res is FALLO_POOL:
+                    # Falló el pool, no el extractor: la página se parsea en un hilo
+                    fut = ex.submit(_parsear_en_hilo, en_parseo.url, en_parseo.pagina)
+                    descargas.add(fut)
+                    pendientes.add(fut)
+                    continue
+                _anotar(registro, en_parseo.url, res, False)
+            hechos += 1
+            if res:
+                resultados.append(res)
+            if progress_callback:
+                progress = 60 + int(hechos / total * 40)
+                progress_callback(progress, f"📥 Descargando artículos ({hechos}/{total})…")
+    print(f"[CRAWL] Pipeline {base_url}: {contadores.resumen()}")
+    return resultados
+
+def scrapear_noticias_exhaustivo(base_url, progress_callback=None, max_links=600, max_pages=12, max_workers=10, modo="hilos", executor=None):
+    """
+    Devuelve lista de tuplas (titulo, fecha, categoria, contenido, imagen, url)
+    modo: "hilos" (ThreadPoolExecutor) o "async" (asyncio, cientos de requests en vuelo)
+    executor: pool de descargas compartido (ver scrapear_fuentes); sin él se crea uno de max_workers
+    """
+    if modo == "async":
+        return asyncio.run(_scrapear_async(base_url, progress_callback, max_links, max_pages))
+
+    # Pool de conexiones keep-alive dimensionado para los workers de descarga
+    obtener_sesion(max_workers)
+    inicio = datetime.now()
+    _cargar_plantilla(base_url)
+
+    urls = _frontera_reanudable(base_url, max_links)
+    if urls:
+        descubiertas = True
+        if progress_callback: progress_callback(55, f"♻️ Reanudando crawl interrumpido ({len(urls)} pendientes)…")
+    else:
+        if progress_callback: progress_callback(5, "🔎 Descubriendo artículos (RSS, portada, paginación, sitemap)…")
+        urls, tiempos = descubrir_urls(base_url, max_links, max_pages, progress_callback)
+        _log_tiempos(base_url, tiempos)
+        descubiertas = bool(urls)
+        urls = _encolar_descubiertas(base_url, urls, max_links)
+
+    if not urls:
+        _marcar_crawl_ok(base_url, inicio, descubiertas)
+        if progress_callback: progress_callback(100, "⚠️ No se hallaron artículos.")
+        return []
+
+    registro = frontera_crawl.RegistroFrontera()
+    try:
+        if executor is not None:
+            resultados = _descargar_articulos(urls, base_url, executor, max_workers, progress_callback, registro)
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
+                resultados = _descargar_articulos(urls, base_url, ex, max_workers, progress_callback, registro)
+    finally:
+        registro.vaciar()
+        indice_urls.vaciar()
+
+    _log_estructurados(base_url)
+    _marcar_crawl_ok(base_url, inicio, descubiertas)
+    if progress_callback:
+        progress_callback(100, f" Completado - {len(resultados)} artículos válidos")
+
+    return resultados
+
+# ============ MOTOR ASÍNCRONO ============
+async def _descubre_async(cliente, base_url, max_links, max_pages):
+    """RSS, portada, paginación y sitemap a la vez; devuelve (urls, tiempos por etapa)"""
+
+    async def get_condicional(url, timeout, extraer):
+        """Como _descubrir_condicional; la base y el parseo van a hilos para no bloquear el loop"""
+        validador = await asyncio.to_thread(cargar_validador, url)
+        r = await cliente.get(url, timeout=timeout, headers=cabeceras_condicionales(validador))
+        if r is None:
+            return None
+        return await asyncio.to_thread(_enlaces_condicionales, url, validador, r.status, r.headers, lambda: extraer(r))
+
+    async def probar_feeds(candidatos):
+        urls, funcionaron = FronteraFrescura(), set()
+        extraer = _extraer_feed(base_url)
+        partes = await asyncio.gather(*(get_condicional(urljoin(base_url, f"/{c}"), 10, extraer) for c in candidatos))
+        for c, parte in zip(candidatos, partes):
+            if parte is not None:
+                urls |= parte
+                funcionaron.add(c)
+        return urls, funcionaron
+
+    async def rss():
+        candidatos, completo = await asyncio.to_thread(_plan_rss, base_url)
+        urls, funcionaron = await probar_feeds(candidatos)
+        if candidatos and not funcionaron and not completo:
+            candidatos, completo = await asyncio.to_thread(_plan_rss, base_url, True)
+            urls, funcionaron = await probar_feeds(candidatos)
+        await asyncio.to_thread(_aprender_rss, base_url, funcionaron, completo)
+        return urls
+
+    async def home():
+        urls = await get_condicional(base_url, 15, _extraer_portada(base_url, max_links // 2))
+        return urls or FronteraFrescura()
+
+    async def probar_paginacion(plan):
+        links = {}
+        partes = await asyncio.gather(*(get_condicional(url, 10, _extraer_listado(base_url, pagina)) for _, pagina, url in plan))
+        for (esquema, pagina, _), parte in zip(plan, partes):
+            if parte is not None:
+                links[(esquema, pagina)] = parte
+        return links
+
+    async def paginacion():
+        plan, completo = await asyncio.to_thread(_plan_paginacion, base_url, max_pages)
+        links = await probar_paginacion(plan)
+        if plan and not links and not completo:
+            plan, completo = await asyncio.to_thread(_plan_paginacion, base_url, max_pages, True)
+            links = await probar_paginacion(plan)
+        await asyncio.to_thread(_aprender_paginacion, base_url, links, completo)
+        return FronteraFrescura.union(links.values())
+
+    async def sitemap():
+        # El lector de sitemaps es streaming y síncrono: va a un hilo aparte
+        return await asyncio.to_thread(descubre_desde_sitemap, base_url, max_links)
 
+    async def _medir(nombre, coro):
+        t0 = time.time()
+        parte = await coro
+        return nombre, parte, round(time.time() - t0, 2)
+
+    urls, tiempos = FronteraFrescura(), {}
+    inicio = time.time()
+    etapas = [("rss", rss()), ("portada", home()), ("paginacion", paginacion()), ("sitemap", sitemap())]
+    for nombre, parte, seg in await asyncio.gather(*(_medir(n, c) for n, c in etapas)):
+        urls |= parte
+        tiempos[nombre] = seg
+    tiempos["total"] = round(time.time() - inicio, 2)
+    return urls, tiempos
+
+async def _fetch_articulo_async(cliente, url, base_url, registro=None, contadores=None):
+    resultado, reintentar = None, False
+    permitido = await asyncio.to_thread(es_permitido_por_robots, base_url, urlparse(url).path)
+    if permitido:
+        limitador = limitador_para(url, robots_cache.crawl_delay(url, HEADERS["User-Agent"]))
+
+        for intento in range(3):
+            await limitador.adquirir_async()
+            inicio = time.monotonic()
+            r = await cliente.get_html(url, timeout=15)
+            if contadores is not None:
+                contadores.descarga(time.monotonic() - inicio, len(r.contenido or b"") if r else 0)
+            limitador.liberar(r.status if r else None, r.headers.get("Retry-After") if r else None)
+            if r is None or r.status >= 500 or r.status == 429:
+                continue
+            if r.contenido is not None:
+                if cache_html.activa:
+                    await asyncio.to_thread(cache_html.guardar, url, r.contenido, r.encoding)
+                await asyncio.to_thread(indice_urls.registrar_canonica, url, canonica_declarada(r.contenido, url))
+                # El parseo va al pool de procesos (o a un hilo) para no bloquear el event loop
+                resultado = await pipeline_parseo.parsear_async(
+                    r.contenido, url, r.encoding, contadores or ContadoresEtapas()
+                )
+            break
+        else:
+            reintentar = True
+    # El registro puede escribir en la base al llenar un lote
+    await asyncio.to_thread(_anotar, registro, url, resultado, reintentar)
+    return resultado
+
+async def _scrapear_fuente_async(cliente, base_url, progress_callback=None, max_links=600, max_pages=12):
+    inicio = datetime.now()
+    await asyncio.to_thread(_cargar_plantilla, base_url)
+    urls = await asyncio.to_thread(_frontera_reanudable, base_url, max_links)
+    if urls:
+        descubiertas = True
+        if progress_callback: progress_callback(55, f"♻️ Reanudando crawl interrumpido ({len(urls)} pendientes)…")
+    else:
+        if progress_callback: progress_callback(5, "🔎 Descubriendo artículos (RSS, portada, paginación, sitemap)…")
+        urls, tiempos = await _descubre_async(cliente, base_url, max_links, max_pages)
+        _log_tiempos(base_url, tiempos)
+        descubiertas = bool(urls)
+        urls = await asyncio.to_thread(_encolar_descubiertas, base_url, urls, max_links)
+
+    if not urls:
+        _marcar_crawl_ok(base_url, inicio, descubiertas)
+        if progress_callback: progress_callback(100, "⚠️ No se hallaron artículos.")
+        return []
+
+    resultados = []
     total = len(urls)
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futs = {ex.submit(_task, u): idx for idx, u in enumerate(urls)}
-        for i, fut in enumerate(concurrent.futures.as_completed(futs)):
-            res = fut.result()
+    registro = frontera_crawl.RegistroFrontera()
+    contadores = ContadoresEtapas()
+    try:
+        tareas = [asyncio.create_task(_fetch_articulo_async(cliente, u, base_url, registro, contadores)) for u in urls]
+        for i, tarea in enumerate(asyncio.as_completed(tareas)):
+            res = await tarea
             if res:
                 resultados.append(res)
             if progress_callback:
                 progress = 60 + int((i + 1) / total * 40)
                 progress_callback(progress, f"📥 Descargando artículos ({i+1}/{total})…")
+    finally:
+        await asyncio.to_thread(registro.vaciar)
+        await asyncio.to_thread(indice_urls.vaciar)
 
+    print(f"[CRAWL] Pipeline {base_url}: {contadores.resumen()}")
+    _log_estructurados(base_url)
+    _marcar_crawl_ok(base_url, inicio, descubiertas)
     if progress_callback:
         progress_callback(100, f" Completado - {len(resultados)} artículos válidos")
 
     return resultados
 
+async def _scrapear_async(base_url, progress_callback=None, max_links=600, max_pages=12):
+    async with ClienteAsync() as cliente:
+        return await _scrapear_fuente_async(cliente, base_url, progress_callback, max_links, max_pages)
+
+# ============ VARIAS FUENTES A LA VEZ ============
+# Hilos de descarga compartidos por todas las fuentes de un scraping múltiple
+MAX_WORKERS_GLOBAL = 32
+
+class _ProgresoCombinado:
+    """
+    Junta el progreso (0-100) de cada fuente en uno solo: el promedio de todas.
+    Las fuentes pueden informar desde cualquier hilo; el callback de la interfaz
+    solo se invoca desde el hilo que creó el objeto (Streamlit no admite otros).
+    """
+
+    def __init__(self, nombres, progress_callback):
+        self._estado = {n: 0 for n in nombres}
+        self._ultimo = ""
+        self._callback = progress_callback
+        self._hilo = threading.current_thread()
+        self._lock = threading.Lock()
+
+    def para(self, nombre):
+        def _callback(percent, message):
+            with self._lock:
+                self._estado[nombre] = max(self._estado[nombre], percent)
+                self._ultimo = f"{nombre}: {message}"
+            if threading.current_thread() is self._hilo:
+                self.publicar()
+        return _callback
+
+    def publicar(self):
+        if not self._callback:
+            return
+        with self._lock:
+            percent = int(sum(self._estado.values()) / len(self._estado))
+            listas = sum(1 for p in self._estado.values() if p >= 100)
+            mensaje = f"{listas}/{len(self._estado)} fuentes listas · {self._ultimo}"
+        self._callback(percent, mensaje)
+
+def scrapear_fuentes(fuentes, progress_callback=None, max_links=600, max_pages=12, max_workers=10,
+                     max_workers_global=MAX_WORKERS_GLOBAL, modo="hilos"):
+    """
+    Scrapea varias fuentes a la vez. fuentes: {nombre: base_url}.
+    Devuelve {nombre: [tuplas]} (lista vacía si la fuente falló).
+    - hilos: todas las descargas comparten un pool de max_workers_global hilos y
+      cada fuente tiene como mucho max_workers artículos en vuelo
+    - async: un único ClienteAsync con su límite global y por host
+    En ambos casos el limitador adaptativo de cada host sigue aplicando.
+    """
+    if not fuentes:
+        return {}
+    progreso = _ProgresoCombinado(fuentes, progress_callback)
+    if modo == "async":
+        return asyncio.run(_scrapear_fuentes_async(fuentes, progreso, max_links, max_pages))
+
+    resultados = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers_global) as descargas, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=len(fuentes)) as coordinadores:
+        futs = {
+            coordinadores.submit(scrapear_noticias_exhaustivo, url, progreso.para(nombre), max_links,
+                                 max_pages, max_workers, "hilos", descargas): nombre
+            for nombre, url in fuentes.items()
+        }
+        pendientes = set(futs)
+        while pendientes:
+            listos, pendientes = concurrent.futures.wait(pendientes, timeout=0.5)
+            for fut in listos:
+                nombre = futs[fut]
+                try:
+                    resultados[nombre] = fut.result()
+                except Exception as e:
+                    print(f"[CRAWL] Error scrapeando {nombre}: {e}")
+                    resultados[nombre] = []
+            progreso.publicar()
+    return resultados
+
+async def _scrapear_fuentes_async(fuentes, progreso, max_links, max_pages):
+    async with ClienteAsync() as cliente:
+        async def _una(nombre, url):
+            try:
+                return await _scrapear_fuente_async(cliente, url, progreso.para(nombre), max_links, max_pages)
+            except Exception as e:
+                print(f"[CRAWL] Error scrapeando {nombre}: {e}")
+                return []
+        listas = await asyncio.gather(*(_una(n, u) for n, u in fuentes.items()))
+    return dict(zip(fuentes, listas))
+
 # Función principal
 def main():
     load_css()
@@ -622,6 +1170,18 @@ def main():
             st.error("⚠️ Has seleccionado más fuentes de las permitidas para tu rol")
             fuentes_seleccionadas = fuentes_seleccionadas[:len(fuentes_permitidas)]
         
+        # Motor de descarga
+        motores = {
+            "🧵 Hilos": "hilos",
+            "⚡ Asíncrono": "async",
+        }
+        motor = st.selectbox(
+            "Motor de scraping:",
+            list(motores.keys()),
+            help="El motor asíncrono mantiene cientos de descargas en vuelo (con límite por sitio)",
+            key="motor_scraping"
+        )
+        
         # Botón de scraping
         col_btn1, col_btn2 = st.columns([3, 1])
         with col_btn1:
@@ -649,26 +1209,26 @@ def main():
             
             total_insertados = 0
             fuentes_no_permitidas = []
+            fuentes_a_scrapear = {}
             
-            for idx, fuente in enumerate(fuentes_seleccionadas, start=1):
+            for fuente in fuentes_seleccionadas:
                 # Verificar permiso para esta fuente
                 if not verificar_permiso_scraping(rol_usuario, fuente):
                     fuentes_no_permitidas.append(fuente)
                     continue
-                
-                url = fuentes_disponibles[fuente]
-                update_progress(
-                    int((idx / len(fuentes_seleccionadas)) * 100), 
-                    f"Procesando {fuente} ({idx}/{len(fuentes_seleccionadas)})"
-                )
-                noticias = scrapear_noticias_exhaustivo(
-                    url,
-                    update_progress,
-                    max_links=600,
-                    max_pages=12,
-                    max_workers=10
-                )
-                
+                fuentes_a_scrapear[fuente] = fuentes_disponibles[fuente]
+            
+            # Todas las fuentes a la vez, con un presupuesto global de descargas
+            noticias_por_fuente = scrapear_fuentes(
+                fuentes_a_scrapear,
+                update_progress,
+                max_links=600,
+                max_pages=12,
+                max_workers=10,
+                modo=motores[motor]
+            )
+            
+            for noticias in noticias_por_fuente.values():
                 if noticias:
                     insertados = guardar_en_mysql(noticias)
                     total_insertados += insertados
@@ -845,40 +1405,7 @@ def main():
     # ============ CONTENIDO PRINCIPAL ============
     df = cargar_noticias()
 
-    # 🔥🔥🔥 LIMPIEZA NUCLEAR DE HTML - ESTO SÍ FUNCIONA 🔥🔥🔥
-    if not df.empty:
-        import html
-        import re
-        
-    def limpieza_nuclear(texto):
-        if pd.isna(texto) or not texto:
-            return ""
-        texto_str = str(texto)
-        
-        # ELIMINACIÓN COMPLETA DE HTML
-        texto_str = re.sub(r'<[^>]*>', '', texto_str)  # Elimina <cualquier_tag>
-        texto_str = re.sub(r'&[a-z]+;', '', texto_str)  # Elimina &nbsp; &amp; etc.
-        
-        # DECODIFICAR entidades HTML
-        texto_str = html.unescape(texto_str)
-        
-        # ELIMINAR caracteres especiales problemáticos
-        texto_str = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', texto_str)
-        
-        # LIMPIAR espacios y saltos de línea
-        texto_str = ' '.join(texto_str.split())
-        
-        return texto_str.strip()
-    
-    # APLICAR LIMPIEZA NUCLEAR
-        df['titulo'] = df['titulo'].apply(limpieza_nuclear)
-        df['contenido'] = df['contenido'].apply(limpieza_nuclear)
-        
-    # VERIFICAR en consola
-    print("✅ LIMPIEZA NUCLEAR APLICADA")
-    if not df.empty:
-        print(f"📰 Primer título: {df.iloc[0]['titulo'][:50]}")
-        print(f"📄 Primer contenido: {df.iloc[0]['contenido'][:50]}")
+    # titulo y contenido ya vienen limpios de la base (se limpian al guardar, utils/texto.py)
     
     # Mostrar notificaciones
     if 'nuevas_noticias' in st.session_state and st.session_state.nuevas_noticias > 0:
@@ -893,7 +1420,7 @@ def main():
             if not df.empty:
                 # Búsqueda avanzada
                 busqueda, categoria = barra_busqueda_avanzada(df)
-                df_filtrado = filtrar_noticias(df, categoria, busqueda)
+                df_filtrado = agrupar_historias(filtrar_noticias(df, categoria, busqueda))
                 
                 # Estadísticas de filtrado
                 if busqueda or categoria != "Todas":
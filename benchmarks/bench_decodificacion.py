@@ -0,0 +1,80 @@
+# benchmarks/bench_decodificacion.py - Costo de decodificar artículos: response.text vs bytes + charset decidido
+#
+# Uso: python benchmarks/bench_decodificacion.py [paginas]
+#
+# Compara, sobre páginas sintéticas en UTF-8 sin charset en las cabeceras:
+#   actual  -> response.text de requests (sin Content-Type detecta el charset sobre todo el cuerpo;
+#              con "text/html" a secas decodifica como ISO-8859-1 y rompe las tildes)
+#   nuevo   -> utils.codificacion.decidir_encoding (decisión cacheada por host) + bytes al parser
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+from requests.utils import get_encoding_from_headers
+from bs4 import BeautifulSoup
+
+from utils.codificacion import decidir_encoding
+
+PARRAFO = (
+    "<p>El Congreso de la República aprobó en primera votación la reforma "
+    "que modifica la elección de autoridades en Áncash, Cusco y Piura; "
+    "según el informe, la decisión generó críticas del Ejecutivo — «no hubo diálogo», "
+    "señaló el ministro. La medida entrará en vigor el próximo año.</p>\n"
+)
+
+
+def pagina(i):
+    cuerpo = PARRAFO * 300
+    return (
+        f"<html><head><title>Noticia {i}</title></head><body>"
+        f"<h1>Titular número {i}: protestas en Huancayo</h1><article>{cuerpo}</article>"
+        "</body></html>"
+    ).encode("utf-8")
+
+
+def respuesta(contenido, content_type):
+    r = requests.Response()
+    r._content = contenido
+    r.status_code = 200
+    if content_type:
+        r.headers["Content-Type"] = content_type
+    # Lo que hace el adapter de requests al construir la respuesta
+    r.encoding = get_encoding_from_headers(r.headers)
+    return r
+
+
+def medir(nombre, funcion, paginas):
+    t0 = time.perf_counter()
+    textos = [funcion(p) for p in paginas]
+    seg = time.perf_counter() - t0
+    correctas = sum(1 for t in textos if "número" in t)
+    print(f"{nombre:<38} {seg * 1000 / len(paginas):8.2f} ms/página   tildes correctas {correctas}/{len(paginas)}")
+    return seg
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    paginas = [pagina(i) for i in range(n)]
+    print(f"{n} páginas de {len(paginas[0]) // 1024} KB\n")
+
+    print("Solo decodificar:")
+    medir("actual (sin Content-Type)", lambda p: respuesta(p, None).text, paginas)
+    medir("actual (text/html sin charset)", lambda p: respuesta(p, "text/html").text, paginas)
+    medir("nuevo (bytes + encoding por host)",
+          lambda p: p.decode(decidir_encoding("https://medio.pe/nota", p)), paginas)
+
+    print("\nDecodificar + parsear (html.parser):")
+    base = medir("actual (sin Content-Type)",
+                 lambda p: BeautifulSoup(respuesta(p, None).text, "html.parser").get_text(), paginas)
+    nuevo = medir("nuevo (bytes + encoding por host)",
+                  lambda p: BeautifulSoup(p, "html.parser",
+                                          from_encoding=decidir_encoding("https://medio.pe/nota", p)).get_text(),
+                  paginas)
+    print(f"\nAhorro por página: {(base - nuevo) * 1000 / n:.2f} ms ({(1 - nuevo / base) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/bench_parser.py - Throughput de parsear_articulo con html.parser vs lxml
+#
+# Uso:
+#   python benchmarks/bench_parser.py                  # páginas de la caché (CACHE_HTML_DIR) o sintéticas
+#   python benchmarks/bench_parser.py --cache /ruta/cache --max 500
+#   python benchmarks/bench_parser.py --sinteticas 200
+#
+# Con páginas guardadas (utils/cache_html.py) mide sobre HTML real de las fuentes y
+# cuenta en cuántas los dos backends extraen exactamente lo mismo.
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.cache_html import DIRECTORIO, CacheHtml
+from utils.extraccion import crear_soup, parsear_articulo
+
+PARRAFO = (
+    "<p>El Congreso de la República aprobó en primera votación la reforma "
+    "que modifica la elección de autoridades en Áncash, Cusco y Piura; "
+    "según el informe, la decisión generó críticas del Ejecutivo.</p>\n"
+)
+
+
+def pagina_sintetica(i):
+    menu = "".join(f'<li class="menu-item"><a href="/seccion-{j}">Sección {j}</a></li>' for j in range(80))
+    cuerpo = PARRAFO * 40
+    return (
+        f'<html><head><title>Noticia {i}</title>'
+        f'<meta property="article:published_time" content="2025-10-{i % 28 + 1:02d}T10:00:00Z">'
+        f'<meta property="og:image" content="/img/{i}.jpg"></head><body>'
+        f'<header><ul class="menu">{menu}</ul></header>'
+        f'<h1 class="entry-title">Titular de la noticia número {i}</h1>'
+        f'<a rel="category tag" href="/politica">Política</a>'
+        f'<article><div class="entry-content">{cuerpo}</div></article>'
+        f'<footer>{menu}</footer></body></html>'
+    ).encode("utf-8")
+
+
+def cargar_paginas(args):
+    """[(url, contenido, encoding)] de la caché o sintéticas"""
+    directorio = args.cache or DIRECTORIO
+    if directorio and not args.sinteticas:
+        paginas = []
+        for ruta in CacheHtml(directorio).rutas():
+            try:
+                cabecera, contenido = CacheHtml.leer_archivo(ruta)
+            except Exception:
+                continue
+            paginas.append((cabecera["url"], contenido, cabecera.get("encoding")))
+            if len(paginas) >= args.max:
+                break
+        if paginas:
+            print(f"{len(paginas)} páginas de la caché {directorio}")
+            return paginas
+    n = args.sinteticas or 100
+    print(f"{n} páginas sintéticas")
+    return [(f"https://medio.pe/nota-{i}", pagina_sintetica(i), "utf-8") for i in range(n)]
+
+
+def medir_soup(parser, paginas):
+    t0 = time.perf_counter()
+    for _, c, enc in paginas:
+        crear_soup(c, enc, parser)
+    seg = time.perf_counter() - t0
+    print(f"{parser:<12} {seg * 1000 / len(paginas):8.2f} ms/página  {len(paginas) / seg:8.1f} páginas/s")
+    return seg
+
+
+def medir(parser, paginas):
+    t0 = time.perf_counter()
+    resultados = [parsear_articulo(c, url, enc, parser=parser) for url, c, enc in paginas]
+    seg = time.perf_counter() - t0
+    validos = sum(1 for r in resultados if r)
+    print(f"{parser:<12} {seg * 1000 / len(paginas):8.2f} ms/página  {len(paginas) / seg:8.1f} páginas/s  "
+          f"válidas {validos}/{len(paginas)}")
+    return seg, resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara los backends de parseo de artículos")
+    parser.add_argument("--cache", help="Directorio de la caché de HTML (por defecto CACHE_HTML_DIR)")
+    parser.add_argument("--max", type=int, default=1000, help="Máximo de páginas de la caché")
+    parser.add_argument("--sinteticas", type=int, default=0, help="Usar N páginas sintéticas")
+    args = parser.parse_args()
+
+    paginas = cargar_paginas(args)
+    print("\nSolo construir el árbol:")
+    arbol_base = medir_soup("html.parser", paginas)
+    arbol_rapido = medir_soup("lxml", paginas)
+
+    print("\nparsear_articulo completo (árbol + extractores):")
+    base, con_html_parser = medir("html.parser", paginas)
+    rapido, con_lxml = medir("lxml", paginas)
+
+    # La fecha de respaldo es datetime.now(): no cuenta como diferencia
+    iguales = sum(
+        1 for a, b in zip(con_html_parser, con_lxml)
+        if (a is None and b is None) or (a and b and a[0] == b[0] and a[2:] == b[2:])
+    )
+    print(f"\nlxml: árbol {arbol_base / arbol_rapido:.1f}x más rápido, artículo completo {base / rapido:.1f}x; "
+          f"mismo resultado en {iguales}/{len(paginas)} páginas")
+
+
+if __name__ == "__main__":
+    main()
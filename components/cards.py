@@ -7,7 +7,6 @@ from urllib.parse import urlparse
 
 import streamlit as st
 import pandas as pd
-from bs4 import BeautifulSoup
 
 from components.notifications import mostrar_toast
 from utils.helpers import registrar_lectura
@@ -15,13 +14,15 @@ from utils.helpers import registrar_lectura
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def calcular_tiempo_relativo(fecha_scraping):
-    """Calcula tiempo relativo desde fecha de scraping."""
+def calcular_tiempo_relativo(fecha, utc=False):
+    """Tiempo relativo desde una fecha de la base (datetime; en UTC si utc=True)."""
     try:
-        if not fecha_scraping:
+        if fecha is None or pd.isna(fecha):
             return "Reciente"
-        fecha = pd.to_datetime(fecha_scraping)
-        diff = datetime.now() - fecha
+        if not isinstance(fecha, datetime):
+            # Solo texto suelto; las columnas de la base ya llegan como datetime
+            fecha = pd.to_datetime(fecha)
+        diff = (datetime.utcnow() if utc else datetime.now()) - fecha
 
         if diff.days > 30:
             m = diff.days // 30
@@ -38,13 +39,14 @@ def calcular_tiempo_relativo(fecha_scraping):
     except:
         return "Reciente"
 
-def obtener_fuente(url):
-    """Extrae dominio legible desde una URL."""
+def obtener_fuente(fuente, url=None):
+    """Nombre legible desde la clave de fuente guardada (SCRAP.fuente, "andina.pe"); la URL solo para filas sin migrar."""
     try:
-        if not url:
+        if not fuente and url:
+            fuente = urlparse(url).netloc.replace("www.", "")
+        if not fuente:
             return "Desconocida"
-        host = urlparse(url).netloc.replace("www.", "")
-        return host.split('.')[0].title() if '.' in host else host
+        return fuente.split('.')[0].title() if '.' in fuente else fuente
     except Exception:
         return "Desconocida"
 
@@ -63,41 +65,6 @@ def toggle_favorito(nid, es_fav):
         logger.error(f"Error toggling favorito: {e}")
         mostrar_toast("❌ Error al actualizar favoritos", "error")
 
-def limpiar_contenido_html(texto):
-    """Limpia contenido HTML y siempre retorna string (sin tags peligrosos)."""
-    try:
-        if texto is None:
-            return ""
-        if not isinstance(texto, str):
-            texto = str(texto)
-        texto = texto.strip()
-        if not texto:
-            return ""
-        
-        # Si no tiene tags HTML, retornar directamente
-        if '<' not in texto and '>' not in texto:
-            return texto
-            
-        texto = html_lib.unescape(texto)
-        soup = BeautifulSoup(texto, "html.parser")
-        
-        # Eliminar elementos no deseados
-        for tag in soup.find_all(["script", "style", "img", "picture", "figure", "iframe"]):
-            tag.decompose()
-        
-        # Quitar atributos peligrosos
-        for el in soup.find_all(True):
-            for attr in list(el.attrs):
-                if attr.lower().startswith("on") or attr.lower() in ("style", "srcset"):
-                    del el.attrs[attr]
-        
-        texto_limpio = soup.get_text(" ", strip=True)
-        return texto_limpio or ""
-        
-    except Exception as e:
-        logger.exception("Error limpiando HTML")
-        return re.sub(r"<[^>]+>", "", str(texto) or "")
-
 def mostrar_card_noticia_mejorada(noticia):
     """Muestra una card única y robusta para una noticia (versión corregida)."""
     try:
@@ -119,10 +86,11 @@ def mostrar_card_noticia_mejorada(noticia):
         es_favorito = nid in st.session_state.favoritos
         lecturas = st.session_state.lecturas.get(nid, 0)
 
-        # TÍTULO CORREGIDO - SIN html_lib.escape
+        # TÍTULO
+        # titulo y extracto llegan como texto plano (limpiados al guardar): se escapan
+        # una sola vez aquí, sin entidades dobles, y nada del texto se interpreta como HTML
         titulo = str(noticia.get("titulo") or "Sin título")
-        titulo_limpio = limpiar_contenido_html(titulo)
-        titulo_html = titulo_limpio[:400]  # SIN ESCAPE
+        titulo_html = html_lib.escape(titulo[:400])
 
         # IMAGEN
         imagen = noticia.get("imagen") or noticia.get("imagen_url") or ""
@@ -141,25 +109,29 @@ def mostrar_card_noticia_mejorada(noticia):
             </div>
             """
 
-        # CONTENIDO CORREGIDO - SIN html_lib.escape
-        contenido_raw = noticia.get("contenido") or noticia.get("resumen") or ""
-        contenido_limpio = limpiar_contenido_html(contenido_raw)
+        # CONTENIDO
+        # Extracto calculado al guardar (la fila del listado no trae el cuerpo)
+        resumen = str(noticia.get("extracto") or noticia.get("resumen") or "")
         
-        if contenido_limpio and contenido_limpio.strip():
-            resumen = contenido_limpio[:220] + "..." if len(contenido_limpio) > 220 else contenido_limpio
-            contenido_html = f'<div class="news-content">{resumen}</div>'  # SIN ESCAPE
+        if resumen.strip():
+            contenido_html = f'<div class="news-content">{html_lib.escape(resumen)}</div>'
         else:
             contenido_html = '<div class="news-content no-content">Sin contenido disponible</div>'
 
-        # CATEGORIA CORREGIDA - SIN html_lib.escape
+        # CATEGORIA
         categoria = noticia.get("categoria") or "General"
         cat_slug = re.sub(r"[^a-z0-9]+", "-", str(categoria).lower()).strip("-")
         categoria_class = f"category-{cat_slug}" if cat_slug else "category-general"
-        categoria_html = str(categoria)  # SIN ESCAPE
+        categoria_html = html_lib.escape(str(categoria))
 
         # TIEMPO Y FUENTE
-        tiempo_str = calcular_tiempo_relativo(noticia.get("fecha_scraping"))
-        fuente = obtener_fuente(noticia.get("url_original"))
+        tiempo_str = calcular_tiempo_relativo(noticia.get("fecha_publicacion"), utc=True)
+        fuente = obtener_fuente(noticia.get("fuente"), noticia.get("url_original"))
+        otras_fuentes = int(noticia.get("fuentes_historia") or 1) - 1
+        if otras_fuentes > 0:
+            fuente += f" +{otras_fuentes}"
+        minutos = noticia.get("minutos_lectura")
+        minutos = int(minutos) if pd.notna(minutos) and minutos else 1
 
         # CARD HTML CORREGIDA
         card_html = f"""
@@ -170,7 +142,8 @@ def mostrar_card_noticia_mejorada(noticia):
             <div class="news-meta">
                 <span class="meta-time">⏰ {tiempo_str}</span>
                 <span class="meta-views">👁️ {lecturas}</span>
-                <span class="meta-source">📰 {fuente}</span>
+                <span class="meta-source">📰 {html_lib.escape(fuente)}</span>
+                <span class="meta-time">📖 {minutos} min</span>
             </div>
             {contenido_html}
         </div>
@@ -283,17 +256,17 @@ def mostrar_card_compacta(noticia):
 
         es_fav = nid in st.session_state.favoritos
         lecturas = st.session_state.lecturas.get(nid, 0)
-        tiempo_str = calcular_tiempo_relativo(noticia.get("fecha_scraping"))
+        tiempo_str = calcular_tiempo_relativo(noticia.get("fecha_publicacion"), utc=True)
 
-        # TÍTULO CORREGIDO - SIN html_lib.escape
+        # TÍTULO (texto plano, se escapa al insertarlo)
         titulo = str(noticia.get("titulo") or "Sin título")
-        titulo_limpio = limpiar_contenido_html(titulo)
-        titulo_corto = titulo_limpio[:70] + "..." if len(titulo_limpio) > 70 else titulo_limpio
+        titulo_corto = html_lib.escape(titulo[:70] + "..." if len(titulo) > 70 else titulo)
+        categoria = html_lib.escape(str(noticia.get('categoria') or 'General'))
 
         st.markdown(f"""
         <div class="compact-card">
             <div class="compact-header">
-                <span class="compact-category">{noticia.get('categoria', 'General')}</span>
+                <span class="compact-category">{categoria}</span>
                 <span class="compact-time">⏰ {tiempo_str}</span>
             </div>
             <h5 class="compact-title">{titulo_corto}</h5>
@@ -49,6 +49,16 @@ class DatabaseConfig:
         except Error as e:
             print(f"Error al crear la base de datos: {e}")
     
+    @classmethod
+    def _asegurar_columna(cls, cursor, tabla, columna, definicion):
+        """Agrega la columna si la tabla ya existía sin ella (migración simple)"""
+        cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """, (cls.DATABASE, tabla, columna))
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(f"ALTER TABLE {tabla} ADD COLUMN {columna} {definicion}")
+    
     @classmethod
     def setup_tables(cls):
         """Configurar todas las tablas necesarias"""
@@ -73,10 +83,37 @@ class DatabaseConfig:
                 url_original TEXT,
                 fecha_scraping TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 activa BOOLEAN DEFAULT TRUE,
-                UNIQUE KEY unique_titulo (titulo(500))
+                minhash VARBINARY(256) NULL,
+                historia_id INT NULL,
+                fecha_publicacion DATETIME NULL,
+                titulo_limpio VARCHAR(1000) NULL,
+                contenido_limpio LONGTEXT NULL,
+                extracto VARCHAR(300) NULL,
+                palabras INT NULL,
+                minutos_lectura SMALLINT NULL,
+                fuente VARCHAR(255) NULL,
+                UNIQUE KEY unique_titulo (titulo(500)),
+                INDEX idx_historia (historia_id),
+                INDEX idx_fecha_publicacion (fecha_publicacion),
+                INDEX idx_fuente (fuente)
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
             """)
-            
+            # Firma del texto y la historia a la que pertenece (misma nota en varias fuentes)
+            cls._asegurar_columna(cursor, "SCRAP", "minhash", "VARBINARY(256) NULL")
+            cls._asegurar_columna(cursor, "SCRAP", "historia_id", "INT NULL, ADD INDEX idx_historia (historia_id)")
+            # Fecha de publicación en UTC (SCRAP.fecha es el texto tal como vino); las filas
+            # anteriores se completan con migrar_scrap.py
+            cls._asegurar_columna(cursor, "SCRAP", "fecha_publicacion",
+                                  "DATETIME NULL, ADD INDEX idx_fecha_publicacion (fecha_publicacion)")
+            # Título y contenido ya limpios (texto plano) para mostrar sin procesar HTML
+            cls._asegurar_columna(cursor, "SCRAP", "titulo_limpio", "VARCHAR(1000) NULL")
+            cls._asegurar_columna(cursor, "SCRAP", "contenido_limpio", "LONGTEXT NULL")
+            # Lo que necesitan los listados sin leer el cuerpo: extracto, largo y fuente normalizada
+            cls._asegurar_columna(cursor, "SCRAP", "extracto", "VARCHAR(300) NULL")
+            cls._asegurar_columna(cursor, "SCRAP", "palabras", "INT NULL")
+            cls._asegurar_columna(cursor, "SCRAP", "minutos_lectura", "SMALLINT NULL")
+            cls._asegurar_columna(cursor, "SCRAP", "fuente", "VARCHAR(255) NULL, ADD INDEX idx_fuente (fuente)")
+
             # Tabla de favoritos
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS favoritos (
@@ -200,6 +237,65 @@ class DatabaseConfig:
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
             """)
             
+            # Memoria del crawler por dominio (feed y paginación que funcionaron)
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_dominios (
+                dominio VARCHAR(255) PRIMARY KEY,
+                feed_path VARCHAR(100),
+                esquema_paginacion VARCHAR(20),
+                ultima_pagina_util INT,
+                sondeo_rss_en DATETIME NULL,
+                sondeo_paginacion_en DATETIME NULL,
+                ultimo_crawl_ok DATETIME NULL,
+                crawl_en_curso_desde DATETIME NULL,
+                plantilla_extraccion TEXT,
+                fecha_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+            """)
+            cls._asegurar_columna(cursor, "crawl_dominios", "ultimo_crawl_ok", "DATETIME NULL")
+            cls._asegurar_columna(cursor, "crawl_dominios", "crawl_en_curso_desde", "DATETIME NULL")
+            cls._asegurar_columna(cursor, "crawl_dominios", "plantilla_extraccion", "TEXT")
+
+            # Frontera de crawl persistente: lo descubierto y su estado, para reanudar crawls cortados
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_frontera (
+                url_hash CHAR(32) PRIMARY KEY,
+                url TEXT NOT NULL,
+                fuente VARCHAR(255) NOT NULL,
+                prioridad DOUBLE DEFAULT 0,
+                estado ENUM('pendiente', 'hecho', 'descartado', 'fallido') DEFAULT 'pendiente',
+                intentos INT DEFAULT 0,
+                proximo_intento_en DATETIME NULL,
+                fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                fecha_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                INDEX idx_fuente_estado (fuente, estado, prioridad),
+                INDEX idx_fecha_creacion (fecha_creacion)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+            """)
+
+            # Validadores HTTP (ETag / Last-Modified) de feeds, portadas, listados y sitemaps,
+            # con los enlaces que se sacaron de cada uno para reutilizarlos ante un 304
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_validadores (
+                url_hash CHAR(32) PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag VARCHAR(255),
+                last_modified VARCHAR(64),
+                enlaces MEDIUMTEXT,
+                fecha_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+            """)
+
+            # rel=canonical aprendidas: la URL descargada y la canónica que declaró la página
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_canonicas (
+                url_hash CHAR(32) PRIMARY KEY,
+                url TEXT NOT NULL,
+                canonica TEXT NOT NULL,
+                fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+            """)
+            
             # Insertar configuraciones por defecto
             configuraciones_default = [
                 ('url_scraping', 'https://diariosinfronteras.com.pe/', 'URL principal para scraping'),
@@ -0,0 +1,75 @@
+# db/crawl_memoria.py - Memoria por dominio de lo que funcionó en crawls anteriores
+import threading
+
+from config import DatabaseConfig
+
+# Columnas de crawl_dominios que se pueden actualizar
+COLUMNAS = (
+    "feed_path",
+    "esquema_paginacion",
+    "ultima_pagina_util",
+    "sondeo_rss_en",
+    "sondeo_paginacion_en",
+    "ultimo_crawl_ok",
+    "crawl_en_curso_desde",
+    "plantilla_extraccion",
+)
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def cargar_memoria(dominio):
+    """
+    Devuelve un dict con lo aprendido del dominio (vacío si es la primera vez).
+    Se lee de la base una sola vez por proceso; después se sirve desde memoria.
+    """
+    with _lock:
+        if dominio in _cache:
+            return dict(_cache[dominio])
+
+    memoria = {}
+    conn = DatabaseConfig.get_connection()
+    if conn:
+        try:
+            cur = conn.cursor(dictionary=True)
+            cur.execute("SELECT * FROM crawl_dominios WHERE dominio = %s", (dominio,))
+            memoria = cur.fetchone() or {}
+            cur.close()
+        except Exception as e:
+            print(f"[DB] Error leyendo memoria de {dominio}: {e}")
+        finally:
+            conn.close()
+
+    with _lock:
+        _cache.setdefault(dominio, {}).update(memoria)
+        return dict(_cache[dominio])
+
+
+def guardar_memoria(dominio, **campos):
+    """Actualiza (o crea) la fila del dominio con los campos indicados"""
+    campos = {k: v for k, v in campos.items() if k in COLUMNAS}
+    if not campos:
+        return
+    with _lock:
+        _cache.setdefault(dominio, {}).update(campos)
+
+    conn = DatabaseConfig.get_connection()
+    if not conn:
+        return
+    try:
+        cur = conn.cursor()
+        columnas = ", ".join(campos)
+        marcadores = ", ".join(["%s"] * len(campos))
+        updates = ", ".join(f"{c} = VALUES({c})" for c in campos)
+        cur.execute(
+            f"INSERT INTO crawl_dominios (dominio, {columnas}) VALUES (%s, {marcadores}) "
+            f"ON DUPLICATE KEY UPDATE {updates}",
+            (dominio, *campos.values())
+        )
+        conn.commit()
+        cur.close()
+    except Exception as e:
+        print(f"[DB] Error guardando memoria de {dominio}: {e}")
+    finally:
+        conn.close()
@@ -0,0 +1,140 @@
+# db/frontera_crawl.py - Frontera de crawl persistente (sobrevive a reruns de Streamlit y reinicios del daemon)
+import threading
+from hashlib import md5
+
+from config import DatabaseConfig
+
+# Reintentos de una URL que falló por red / 5xx / 429 antes de darla por perdida
+MAX_INTENTOS = 3
+# Espera antes del primer reintento (se duplica con cada intento fallido)
+ESPERA_REINTENTO_MIN = 10
+# Cada cuántos resultados RegistroFrontera escribe en la base
+TAM_LOTE = 25
+
+# Estados:
+#   pendiente  - por descargar (o descargada y válida pero todavía sin guardar en SCRAP)
+#   hecho      - guardada en SCRAP (o ya estaba)
+#   descartado - no es un artículo, 4xx, bloqueada por robots.txt
+#   fallido    - agotó los reintentos
+
+
+def _hash(url):
+    return md5(url.encode("utf-8")).hexdigest()
+
+
+def _ejecutar_lote(sql, filas, contexto):
+    """executemany en una conexión propia; False si no hay base o falló"""
+    if not filas:
+        return True
+    conn = DatabaseConfig.get_connection()
+    if not conn:
+        return False
+    try:
+        cur = conn.cursor()
+        for i in range(0, len(filas), 500):
+            cur.executemany(sql, filas[i:i+500])
+        conn.commit()
+        cur.close()
+        return True
+    except Exception as e:
+        print(f"[DB] Error {contexto}: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+def encolar(fuente, urls):
+    """
+    urls: [(url, prioridad)] con prioridad = instante de publicación estimado (más alto, más fresca).
+    Las URLs ya conocidas no cambian de estado; si siguen pendientes se queda la prioridad más alta.
+    Devuelve False si la base no está disponible.
+    """
+    return _ejecutar_lote(
+        "INSERT INTO crawl_frontera (url_hash, url, fuente, prioridad) VALUES (%s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE prioridad = IF(estado = 'pendiente', GREATEST(prioridad, VALUES(prioridad)), prioridad)",
+        [(_hash(u), u, fuente, float(p or 0)) for u, p in urls],
+        f"encolando frontera de {fuente}"
+    )
+
+
+def pendientes(fuente, limite):
+    """URLs pendientes de la fuente cuyo reintento ya venció, de la más fresca a la más antigua; None sin base"""
+    conn = DatabaseConfig.get_connection()
+    if not conn:
+        return None
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT url FROM crawl_frontera "
+            "WHERE fuente = %s AND estado = 'pendiente' "
+            "AND (proximo_intento_en IS NULL OR proximo_intento_en <= NOW()) "
+            "ORDER BY prioridad DESC LIMIT %s",
+            (fuente, int(limite))
+        )
+        urls = [fila[0] for fila in cur.fetchall()]
+        cur.close()
+        return urls
+    except Exception as e:
+        print(f"[DB] Error leyendo frontera de {fuente}: {e}")
+        return None
+    finally:
+        conn.close()
+
+
+def marcar(urls, estado):
+    """Pasa las URLs a 'hecho' o 'descartado'"""
+    return _ejecutar_lote(
+        "UPDATE crawl_frontera SET estado = %s WHERE url_hash = %s",
+        [(estado, _hash(u)) for u in urls],
+        f"marcando frontera como {estado}"
+    )
+
+
+def reintentar_luego(urls):
+    """Suma un intento y reprograma la URL con backoff; al llegar a MAX_INTENTOS queda 'fallido'"""
+    return _ejecutar_lote(
+        "UPDATE crawl_frontera SET "
+        "estado = IF(intentos + 1 >= %s, 'fallido', 'pendiente'), "
+        "proximo_intento_en = DATE_ADD(NOW(), INTERVAL %s * POW(2, intentos) MINUTE), "
+        "intentos = intentos + 1 "
+        "WHERE url_hash = %s AND estado = 'pendiente'",
+        [(MAX_INTENTOS, ESPERA_REINTENTO_MIN, _hash(u)) for u in urls],
+        "reprogramando frontera"
+    )
+
+
+class RegistroFrontera:
+    """
+    Acumula el resultado de cada descarga (desde varios hilos) y lo escribe en
+    lotes de TAM_LOTE: si el crawl se corta, se pierde a lo sumo un lote.
+    Los artículos válidos no se registran aquí: quedan pendientes hasta que
+    guardar_en_mysql los marca como 'hecho'.
+    """
+
+    def __init__(self, tam_lote=TAM_LOTE):
+        self.tam_lote = tam_lote
+        self._descartadas = []
+        self._reintentos = []
+        self._lock = threading.Lock()
+
+    def descartar(self, url):
+        self._agregar("_descartadas", url)
+
+    def reintentar(self, url):
+        self._agregar("_reintentos", url)
+
+    def _agregar(self, lista, url):
+        with self._lock:
+            # La lista se busca con el lock tomado: vaciar() la reemplaza
+            getattr(self, lista).append(url)
+            lleno = len(self._descartadas) + len(self._reintentos) >= self.tam_lote
+        if lleno:
+            self.vaciar()
+
+    def vaciar(self):
+        with self._lock:
+            descartadas, self._descartadas = self._descartadas, []
+            reintentos, self._reintentos = self._reintentos, []
+        marcar(descartadas, "descartado")
+        reintentar_luego(reintentos)
+
@@ -0,0 +1,88 @@
+# db/indice_historias.py - Índice LSH en memoria de las noticias recientes, para agrupar la misma historia
+import threading
+import time
+
+from config import DatabaseConfig
+from utils.canonical import clave_fuente
+from utils.similitud import BYTES_FIRMA, IndiceLSH, firma
+
+# Solo se buscan duplicados entre las noticias de los últimos días (la misma nota de agencia
+# sale en todas las fuentes el mismo día o el siguiente)
+VENTANA_DIAS = 3
+# Cada cuánto se recarga el índice desde SCRAP (otros procesos también insertan)
+REFRESCO_SEG = 900
+
+
+class IndiceHistorias:
+    """
+    Firmas MinHash (SCRAP.minhash) de las noticias de los últimos VENTANA_DIAS días.
+    Al guardar una noticia se busca otra de distinta fuente con casi el mismo texto:
+    si la hay, la nueva entra en su historia (SCRAP.historia_id = id de la primera
+    noticia de la historia) y la portada muestra una sola tarjeta por historia.
+    """
+
+    def __init__(self, ventana_dias=VENTANA_DIAS, refresco=REFRESCO_SEG):
+        self.ventana_dias = ventana_dias
+        self.refresco = refresco
+        self._indice = IndiceLSH()
+        self._cargado_en = 0.0
+        self._lock = threading.Lock()
+
+    def _cargar(self):
+        conn = DatabaseConfig.get_connection()
+        if not conn:
+            return False
+        indice = IndiceLSH()
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT id, minhash, COALESCE(historia_id, id), fuente, url_original FROM SCRAP "
+                "WHERE minhash IS NOT NULL AND fecha_scraping >= NOW() - INTERVAL %s DAY",
+                (self.ventana_dias,)
+            )
+            while True:
+                filas = cur.fetchmany(5000)
+                if not filas:
+                    break
+                for id_noticia, firma_texto, historia, fuente, url in filas:
+                    if firma_texto and len(firma_texto) == BYTES_FIRMA:
+                        indice.agregar(id_noticia, bytes(firma_texto), historia, fuente or clave_fuente(url))
+            cur.close()
+        except Exception as e:
+            print(f"[DB] Error cargando índice de historias: {e}")
+            return False
+        finally:
+            conn.close()
+        self._indice = indice
+        return True
+
+    def asegurar_cargado(self):
+        with self._lock:
+            if time.time() - self._cargado_en < self.refresco:
+                return
+            # Aunque falle la carga no se reintenta hasta el próximo refresco
+            self._cargado_en = time.time()
+            self._cargar()
+
+    def clasificar(self, contenido, fuente):
+        """(firma, historia_id) para guardar con la noticia; historia_id None si es una historia nueva"""
+        firma_texto = firma(contenido)
+        if firma_texto is None:
+            return None, None
+        self.asegurar_cargado()
+        with self._lock:
+            return firma_texto, self._indice.buscar(firma_texto, fuente)
+
+    def agregar(self, id_noticia, firma_texto, historia_id, fuente):
+        """Registra una noticia recién insertada (historia_id None = encabeza su propia historia)"""
+        if not id_noticia or firma_texto is None:
+            return
+        with self._lock:
+            self._indice.agregar(id_noticia, firma_texto, historia_id or id_noticia, fuente)
+
+    def __len__(self):
+        return len(self._indice)
+
+
+# Instancia única del proceso
+indice_historias = IndiceHistorias()
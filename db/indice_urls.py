@@ -0,0 +1,130 @@
+# db/indice_urls.py - Índice en memoria de las URLs ya guardadas en SCRAP
+import threading
+import time
+from hashlib import md5
+
+from config import DatabaseConfig
+from utils.canonical import canonizar, clave, huella
+
+# Cada cuánto se recarga el índice completo desde SCRAP (otros procesos también insertan)
+REFRESCO_SEG = 900
+# Cada cuántas canónicas aprendidas se escribe en crawl_canonicas
+TAM_LOTE_CANONICAS = 25
+
+
+class IndiceUrls:
+    """
+    Conjunto de huellas de SCRAP.url_original y de las rel=canonical aprendidas
+    (crawl_canonicas). Se consulta antes de descargar un artículo para no volver a
+    bajar noticias que ya están en la base, tampoco bajo otra URL: la huella es la
+    de la clave canónica (utils/canonical.py), igual para AMP, móvil, http/https,
+    barra final y la misma nota en otra sección.
+    """
+
+    def __init__(self, refresco=REFRESCO_SEG):
+        self.refresco = refresco
+        self._huellas = set()
+        self._cargado_en = 0.0
+        self._canonicas = []
+        self._lock = threading.Lock()
+
+    def _cargar(self):
+        conn = DatabaseConfig.get_connection()
+        if not conn:
+            return False
+        huellas = set()
+        try:
+            cur = conn.cursor()
+            for sql in ("SELECT url_original FROM SCRAP WHERE url_original IS NOT NULL",
+                        "SELECT canonica FROM crawl_canonicas"):
+                cur.execute(sql)
+                while True:
+                    filas = cur.fetchmany(5000)
+                    if not filas:
+                        break
+                    huellas.update(huella(f[0]) for f in filas if f[0])
+            cur.close()
+        except Exception as e:
+            print(f"[DB] Error cargando índice de URLs: {e}")
+            return False
+        finally:
+            conn.close()
+        # Lo aprendido en este proceso y todavía sin escribir no se pierde con el refresco
+        huellas.update(huella(c) for _, c in self._canonicas)
+        self._huellas = huellas
+        return True
+
+    def asegurar_cargado(self):
+        with self._lock:
+            if time.time() - self._cargado_en < self.refresco:
+                return
+            # Aunque falle la carga no se reintenta hasta el próximo refresco
+            self._cargado_en = time.time()
+            self._cargar()
+
+    def contiene(self, url):
+        self.asegurar_cargado()
+        return bool(url) and huella(url) in self._huellas
+
+    def agregar(self, url):
+        if url:
+            self._huellas.add(huella(url))
+
+    def filtrar_nuevas(self, urls):
+        """Devuelve solo las URLs que no están en SCRAP (ni repetidas entre sí), conservando el orden"""
+        self.asegurar_cargado()
+        nuevas, vistas = [], set()
+        for u in urls:
+            h = huella(u) if u else None
+            if h is not None and h not in self._huellas and h not in vistas:
+                vistas.add(h)
+                nuevas.append(u)
+        return nuevas
+
+    def registrar_canonica(self, url, canonica):
+        """
+        Aprende la rel=canonical de una página descargada: si la canónica se
+        descubre más adelante (en el sitemap, en otra sección) ya no se descarga.
+        Se escribe en crawl_canonicas en lotes de TAM_LOTE_CANONICAS.
+        """
+        if not canonica:
+            return
+        canonica = canonizar(canonica, url)
+        if clave(canonica) == clave(url):
+            return
+        with self._lock:
+            self._huellas.add(huella(canonica))
+            self._canonicas.append((url, canonica))
+            lleno = len(self._canonicas) >= TAM_LOTE_CANONICAS
+        if lleno:
+            self.vaciar()
+
+    def vaciar(self):
+        """Escribe las canónicas aprendidas pendientes"""
+        with self._lock:
+            filas, self._canonicas = self._canonicas, []
+        if not filas:
+            return
+        conn = DatabaseConfig.get_connection()
+        if not conn:
+            return
+        try:
+            cur = conn.cursor()
+            cur.executemany(
+                "INSERT INTO crawl_canonicas (url_hash, url, canonica) VALUES (%s, %s, %s) "
+                "ON DUPLICATE KEY UPDATE canonica = VALUES(canonica)",
+                [(md5(u.encode("utf-8")).hexdigest(), u, c) for u, c in filas]
+            )
+            conn.commit()
+            cur.close()
+        except Exception as e:
+            print(f"[DB] Error guardando URLs canónicas: {e}")
+        finally:
+            conn.close()
+
+    def __len__(self):
+        return len(self._huellas)
+
+
+# Instancia única del proceso
+indice_urls = IndiceUrls()
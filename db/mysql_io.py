@@ -3,6 +3,26 @@ import pandas as pd
 import mysql.connector
 from mysql.connector import Error
 from config import DatabaseConfig
+from db.indice_urls import indice_urls
+from db.indice_historias import indice_historias
+from db import frontera_crawl
+from utils.canonical import clave_fuente
+from utils.extraccion import fecha_publicacion
+from utils.texto import extracto, limpiar_texto, minutos_lectura
+
+# Columnas que se calculan al guardar a partir de la tupla del extractor (columnas_derivadas)
+COLUMNAS_DERIVADAS = ("fecha_publicacion", "titulo_limpio", "contenido_limpio",
+                      "extracto", "palabras", "minutos_lectura", "fuente")
+_COLUMNAS_INSERTAR = ("titulo", "fecha", "categoria", "contenido", "imagen", "url_original",
+                      "minhash", "historia_id") + COLUMNAS_DERIVADAS
+SQL_INSERTAR = (f"INSERT INTO SCRAP ({', '.join(_COLUMNAS_INSERTAR)}) "
+                f"VALUES ({', '.join(['%s'] * len(_COLUMNAS_INSERTAR))})")
+
+# Fila angosta de los listados: sin el cuerpo (LONGTEXT), que solo lee el detalle (cargar_contenido).
+# Las filas que migrar_scrap.py todavía no completó traen el título original y se limpian al leer
+COLUMNAS_NOTICIA = """id, COALESCE(titulo_limpio, titulo) AS titulo, titulo_limpio IS NULL AS sin_limpiar,
+                      fecha, categoria, imagen, url_original, fecha_scraping, activa, historia_id,
+                      fecha_publicacion, extracto, palabras, minutos_lectura, fuente"""
 
 def conectar_mysql():
     """Usa la config centralizada"""
@@ -12,6 +32,26 @@ def crear_tablas():
     """Reutiliza la creación desde config.py"""
     DatabaseConfig.setup_tables()
 
+def columnas_derivadas(row):
+    """Valores de COLUMNAS_DERIVADAS para una tupla (titulo, fecha, categoria, contenido, imagen, url_original)"""
+    titulo, fecha, _, contenido, _, url = row[:6]
+    contenido_limpio = limpiar_texto(contenido)
+    palabras = len(contenido_limpio.split())
+    return (fecha_publicacion(fecha), limpiar_texto(titulo), contenido_limpio,
+            extracto(contenido_limpio), palabras, minutos_lectura(palabras), clave_fuente(url))
+
+def insertar_noticia(cur, row):
+    """
+    Inserta una tupla (titulo, fecha, categoria, contenido, imagen, url_original) con sus
+    columnas derivadas. Deja pasar IntegrityError (título repetido) para que decida quien llama.
+    """
+    derivadas = columnas_derivadas(row)
+    # Misma nota ya guardada desde otra fuente: entra en su historia
+    contenido_limpio, fuente = derivadas[2], derivadas[6]
+    firma_texto, historia_id = indice_historias.clasificar(contenido_limpio, fuente)
+    cur.execute(SQL_INSERTAR, tuple(row[:6]) + (firma_texto, historia_id) + derivadas)
+    indice_historias.agregar(cur.lastrowid, firma_texto, historia_id, fuente)
+
 def guardar_en_mysql(noticias):
     """
     noticias: lista de tuplas (titulo, fecha, categoria, contenido, imagen, url_original)
@@ -21,37 +61,52 @@ def guardar_en_mysql(noticias):
         return 0
     cur = conn.cursor()
 
-    sql = """INSERT INTO SCRAP (titulo, fecha, categoria, contenido, imagen, url_original)
-            VALUES (%s, %s, %s, %s, %s, %s)"""
-
     insertados = 0
+    guardadas = []
     for row in noticias:
         try:
-            cur.execute(sql, row)
+            insertar_noticia(cur, row)
             insertados += 1
+            indice_urls.agregar(row[5])
+            guardadas.append(row[5])
         except mysql.connector.IntegrityError:
-            # Evita duplicados por UNIQUE(titulo)
-            pass
+            # Evita duplicados por UNIQUE(titulo); la URL ya no hace falta volver a bajarla
+            indice_urls.agregar(row[5])
+            guardadas.append(row[5])
         except Exception as e:
             print(f"[DB] Error insertando: {e}")
 
     conn.commit()
     cur.close()
     conn.close()
+    # Ya están en SCRAP: la frontera no las vuelve a ofrecer
+    frontera_crawl.marcar(guardadas, "hecho")
     return insertados
 
-def cargar_noticias():
+def cargar_noticias(horas=None):
+    """Noticias de la más a la menos reciente por fecha de publicación; horas: solo las de las últimas N horas"""
     conn = conectar_mysql()
     if not conn:
         return pd.DataFrame()
     try:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM SCRAP ORDER BY fecha_scraping DESC")
+        if horas:
+            cursor.execute(
+                f"SELECT {COLUMNAS_NOTICIA} FROM SCRAP "
+                "WHERE fecha_publicacion >= UTC_TIMESTAMP() - INTERVAL %s HOUR "
+                "ORDER BY fecha_publicacion DESC", (int(horas),)
+            )
+        else:
+            cursor.execute(f"SELECT {COLUMNAS_NOTICIA} FROM SCRAP ORDER BY fecha_publicacion DESC, fecha_scraping DESC")
         resultados = cursor.fetchall()
         nombres_columnas = [i[0] for i in cursor.description]
         df = pd.DataFrame(resultados, columns=nombres_columnas)
         cursor.close()
         conn.close()
+        # Las vistas insertan el título como HTML: nunca con etiquetas sin limpiar
+        sin_limpiar = df.pop('sin_limpiar').astype(bool)
+        if sin_limpiar.any():
+            df.loc[sin_limpiar, 'titulo'] = df.loc[sin_limpiar, 'titulo'].map(limpiar_texto)
         return df
     except Exception as e:
         print(f"[DB] Error leyendo noticias: {e}")
@@ -59,6 +114,68 @@ def cargar_noticias():
             conn.close()
         return pd.DataFrame()
 
+def cargar_contenido(noticia_id):
+    """Cuerpo limpio de una noticia (la vista de detalle); "" si no se puede leer"""
+    conn = conectar_mysql()
+    if not conn:
+        return ""
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT contenido_limpio, contenido FROM SCRAP WHERE id = %s", (int(noticia_id),))
+        fila = cursor.fetchone()
+        cursor.close()
+        if not fila:
+            return ""
+        contenido_limpio, contenido = fila
+        # Fila sin migrar: se limpia aquí (solo esta noticia)
+        return contenido_limpio if contenido_limpio is not None else limpiar_texto(contenido)
+    except Exception as e:
+        print(f"[DB] Error leyendo contenido: {e}")
+        return ""
+    finally:
+        conn.close()
+
+def buscar_en_contenido(busqueda):
+    """Ids de las noticias cuyo cuerpo contiene el texto (la búsqueda no carga los cuerpos en la app)"""
+    conn = conectar_mysql()
+    if not conn:
+        return set()
+    try:
+        cursor = conn.cursor()
+        # %, _ y \ del texto buscado son literales, no comodines de LIKE
+        patron = busqueda.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        cursor.execute("SELECT id FROM SCRAP WHERE COALESCE(contenido_limpio, contenido) LIKE %s ESCAPE '\\\\'",
+                       (f"%{patron}%",))
+        ids = {fila[0] for fila in cursor.fetchall()}
+        cursor.close()
+        return ids
+    except Exception as e:
+        print(f"[DB] Error buscando noticias: {e}")
+        return set()
+    finally:
+        conn.close()
+
+def contar_por_dia(dias=30):
+    """DataFrame (dia, noticias) de los últimos N días por fecha de publicación (UTC)"""
+    conn = conectar_mysql()
+    if not conn:
+        return pd.DataFrame(columns=["dia", "noticias"])
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT DATE(fecha_publicacion) AS dia, COUNT(*) AS noticias FROM SCRAP "
+            "WHERE fecha_publicacion >= UTC_DATE() - INTERVAL %s DAY "
+            "GROUP BY dia ORDER BY dia", (int(dias),)
+        )
+        df = pd.DataFrame(cursor.fetchall(), columns=["dia", "noticias"])
+        cursor.close()
+        return df
+    except Exception as e:
+        print(f"[DB] Error contando noticias por día: {e}")
+        return pd.DataFrame(columns=["dia", "noticias"])
+    finally:
+        conn.close()
+
 def registrar_lectura(noticia_id, ip_address=None, user_agent=None):
     conn = conectar_mysql()
     if not conn:
@@ -0,0 +1,79 @@
+# db/validadores_http.py - ETag / Last-Modified de los recursos de descubrimiento
+import json
+import threading
+from hashlib import md5
+
+from config import DatabaseConfig
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _hash(url, consumidor):
+    return md5(f"{consumidor}|{url}".encode("utf-8")).hexdigest()
+
+
+def cargar_validador(url, consumidor="app"):
+    """
+    Devuelve {"etag", "last_modified", "enlaces"} guardados para la URL, o None.
+    Cada consumidor (la app, el daemon) tiene su propia fila: guardan los enlaces en
+    formatos distintos y no deben leer los del otro.
+    Se lee de la base una sola vez por proceso; después se sirve desde memoria.
+    """
+    clave = (consumidor, url)
+    with _lock:
+        if clave in _cache:
+            return _cache[clave]
+
+    validador = None
+    conn = DatabaseConfig.get_connection()
+    if conn:
+        try:
+            cur = conn.cursor(dictionary=True)
+            cur.execute(
+                "SELECT etag, last_modified, enlaces FROM crawl_validadores WHERE url_hash = %s",
+                (_hash(url, consumidor),)
+            )
+            fila = cur.fetchone()
+            cur.close()
+            if fila and fila["enlaces"]:
+                validador = {
+                    "etag": fila["etag"],
+                    "last_modified": fila["last_modified"],
+                    "enlaces": json.loads(fila["enlaces"]),
+                }
+        except Exception as e:
+            print(f"[DB] Error leyendo validador de {url}: {e}")
+        finally:
+            conn.close()
+
+    with _lock:
+        _cache.setdefault(clave, validador)
+        return _cache[clave]
+
+
+def guardar_validador(url, etag, last_modified, enlaces, consumidor="app"):
+    """Guarda los validadores de la respuesta y los enlaces (serializables a JSON) sacados de ella"""
+    if not etag and not last_modified:
+        return
+    with _lock:
+        _cache[(consumidor, url)] = {"etag": etag, "last_modified": last_modified, "enlaces": enlaces}
+
+    conn = DatabaseConfig.get_connection()
+    if not conn:
+        return
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO crawl_validadores (url_hash, url, etag, last_modified, enlaces) "
+            "VALUES (%s, %s, %s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE etag = VALUES(etag), last_modified = VALUES(last_modified), "
+            "enlaces = VALUES(enlaces)",
+            (_hash(url, consumidor), url, etag, last_modified, json.dumps(enlaces, ensure_ascii=False))
+        )
+        conn.commit()
+        cur.close()
+    except Exception as e:
+        print(f"[DB] Error guardando validador de {url}: {e}")
+    finally:
+        conn.close()
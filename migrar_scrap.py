@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Completa en las filas antiguas de SCRAP las columnas que hoy se calculan al guardar
+(db/mysql_io.insertar_noticia). Se ejecuta una vez después de `python config.py`;
+es idempotente: solo toca las filas a las que todavía les falta la columna.
+
+Uso:
+    python migrar_scrap.py
+    python migrar_scrap.py --solo fecha_publicacion --simular
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from config import DatabaseConfig
+from utils.canonical import clave_fuente
+from utils.extraccion import fecha_publicacion
+from utils.texto import extracto, limpiar_texto, minutos_lectura
+
+# Filas que se leen y actualizan por commit
+TAM_LOTE = 500
+
+
+def _fecha_publicacion(fila):
+    """fila: (id, fecha, epoch de fecha_scraping) -> (fecha_publicacion, id)"""
+    id_noticia, fecha, epoch_scraping = fila
+    # Sin fecha legible, la de scraping (en UTC, como el resto de la columna)
+    respaldo = datetime.utcfromtimestamp(epoch_scraping) if epoch_scraping else None
+    return fecha_publicacion(fecha, respaldo), id_noticia
+
+
+def _texto_limpio(fila):
+    """fila: (id, titulo, contenido) -> (titulo_limpio, contenido_limpio, id)"""
+    id_noticia, titulo, contenido = fila
+    return limpiar_texto(titulo), limpiar_texto(contenido), id_noticia
+
+
+def _resumen(fila):
+    """fila: (id, contenido_limpio, contenido, url) -> (extracto, palabras, minutos_lectura, fuente, id)"""
+    id_noticia, contenido_limpio, contenido, url = fila
+    if contenido_limpio is None:
+        contenido_limpio = limpiar_texto(contenido)
+    palabras = len(contenido_limpio.split())
+    return extracto(contenido_limpio), palabras, minutos_lectura(palabras), clave_fuente(url), id_noticia
+
+
+# Paso -> (SELECT de las filas pendientes a partir de un id, UPDATE, fila leída -> parámetros del UPDATE)
+PASOS = {
+    "fecha_publicacion": (
+        "SELECT id, fecha, UNIX_TIMESTAMP(fecha_scraping) FROM SCRAP "
+        "WHERE fecha_publicacion IS NULL AND id > %s ORDER BY id LIMIT %s",
+        "UPDATE SCRAP SET fecha_publicacion = %s WHERE id = %s",
+        _fecha_publicacion,
+    ),
+    "texto_limpio": (
+        "SELECT id, titulo, contenido FROM SCRAP "
+        "WHERE titulo_limpio IS NULL AND id > %s ORDER BY id LIMIT %s",
+        "UPDATE SCRAP SET titulo_limpio = %s, contenido_limpio = %s WHERE id = %s",
+        _texto_limpio,
+    ),
+    "resumen": (
+        "SELECT id, contenido_limpio, contenido, url_original FROM SCRAP "
+        "WHERE palabras IS NULL AND id > %s ORDER BY id LIMIT %s",
+        "UPDATE SCRAP SET extracto = %s, palabras = %s, minutos_lectura = %s, fuente = %s WHERE id = %s",
+        _resumen,
+    ),
+}
+
+
+def migrar(paso, simular=False):
+    """Recorre SCRAP por id en lotes; devuelve cuántas filas completó"""
+    select, update, calcular = PASOS[paso]
+    conn = DatabaseConfig.get_connection()
+    if not conn:
+        print("❌ No hay conexión a la base de datos")
+        return 0
+    total, ultimo_id = 0, 0
+    try:
+        cur = conn.cursor()
+        while True:
+            cur.execute(select, (ultimo_id, TAM_LOTE))
+            filas = cur.fetchall()
+            if not filas:
+                break
+            ultimo_id = filas[-1][0]
+            valores = [calcular(f) for f in filas]
+            if not simular:
+                cur.executemany(update, valores)
+                conn.commit()
+            total += len(valores)
+        cur.close()
+    finally:
+        conn.close()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Completa las columnas derivadas de las filas antiguas de SCRAP")
+    parser.add_argument("--solo", choices=sorted(PASOS), help="Ejecutar un solo paso")
+    parser.add_argument("--simular", action="store_true", help="Calcula y cuenta, sin escribir")
+    args = parser.parse_args()
+
+    for paso in [args.solo] if args.solo else PASOS:
+        inicio = time.time()
+        total = migrar(paso, args.simular)
+        print(f"   ✏️ {paso}: {total} filas en {time.time() - inicio:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
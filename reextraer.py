@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Re-extracción de noticias desde la caché de HTML (utils/cache_html.py)
+
+Vuelve a pasar el extractor actual (utils/extraccion.py) por cada página
+guardada y actualiza las filas de SCRAP con la misma url_original, sin
+descargar nada. El parseo se reparte entre todos los núcleos.
+
+Uso:
+    CACHE_HTML_DIR=/ruta/cache python reextraer.py
+    python reextraer.py --cache /ruta/cache --procesos 8 --simular
+    python reextraer.py --insertar-nuevas   # también guarda las que antes no eran válidas
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import mysql.connector
+
+from config import DatabaseConfig
+from db.mysql_io import COLUMNAS_DERIVADAS, columnas_derivadas, guardar_en_mysql
+from utils.cache_html import DIRECTORIO, CacheHtml
+from utils.extraccion import parsear_articulo
+
+# Filas de SCRAP que se actualizan por commit
+TAM_LOTE = 200
+
+SQL_ACTUALIZAR = ("UPDATE SCRAP SET titulo = %s, fecha = %s, categoria = %s, contenido = %s, imagen = %s, "
+                  + ", ".join(f"{c} = %s" for c in COLUMNAS_DERIVADAS) + " WHERE id = %s")
+
+
+def _extraer(ruta):
+    """Se ejecuta en los procesos hijos: lee, descomprime y parsea una página"""
+    try:
+        cabecera, contenido = CacheHtml.leer_archivo(ruta)
+        url = cabecera["url"]
+        return url, parsear_articulo(contenido, url, cabecera.get("encoding"))
+    except Exception:
+        return None, None
+
+
+def _ids_por_url(cur):
+    """{url_original: [ids]} en una sola lectura (url_original es TEXT sin índice: no se busca fila por fila)"""
+    cur.execute("SELECT id, url_original FROM SCRAP WHERE url_original IS NOT NULL")
+    ids = {}
+    for id_noticia, url in cur.fetchall():
+        ids.setdefault(url, []).append(id_noticia)
+    return ids
+
+
+def reextraer(cache, procesos=None, simular=False, insertar_nuevas=False):
+    stats = {"paginas": 0, "validas": 0, "actualizadas": 0, "sin_cambios": 0,
+             "conflictos": 0, "no_validas": 0, "nuevas": 0}
+    conn = None if simular else DatabaseConfig.get_connection()
+    if not simular and not conn:
+        print("❌ No hay conexión a la base de datos")
+        return stats
+    cur = conn.cursor() if conn else None
+    ids_por_url = _ids_por_url(cur) if cur else {}
+    nuevas, pendientes_commit = [], 0
+
+    rutas = list(cache.rutas())
+    with ProcessPoolExecutor(max_workers=procesos) as ex:
+        for url, fila in ex.map(_extraer, rutas, chunksize=32):
+            stats["paginas"] += 1
+            if not fila:
+                stats["no_validas"] += 1
+                continue
+            stats["validas"] += 1
+            if simular:
+                continue
+            ids = ids_por_url.get(url)
+            if not ids:
+                # Sin fila en SCRAP: antes no pasaba el extractor
+                nuevas.append(fila)
+                continue
+            valores = fila[:5] + columnas_derivadas(fila)
+            try:
+                cambiadas = 0
+                for id_noticia in ids:
+                    cur.execute(SQL_ACTUALIZAR, valores + (id_noticia,))
+                    cambiadas += cur.rowcount
+            except mysql.connector.IntegrityError:
+                # Otro artículo ya tiene ese título (UNIQUE)
+                stats["conflictos"] += 1
+                continue
+            if cambiadas:
+                stats["actualizadas"] += 1
+            pendientes_commit += 1
+            if pendientes_commit >= TAM_LOTE:
+                conn.commit()
+                pendientes_commit = 0
+
+    if conn:
+        conn.commit()
+        if insertar_nuevas and nuevas:
+            stats["nuevas"] = guardar_en_mysql(nuevas)
+        stats["sin_cambios"] = stats["validas"] - stats["actualizadas"] - stats["conflictos"] - stats["nuevas"]
+        cur.close()
+        conn.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extrae las noticias de SCRAP desde la caché de HTML")
+    parser.add_argument("--cache", default=DIRECTORIO, help="Directorio de la caché (por defecto CACHE_HTML_DIR)")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count(), help="Procesos de parseo")
+    parser.add_argument("--simular", action="store_true", help="Solo extrae y cuenta, sin tocar la base")
+    parser.add_argument("--insertar-nuevas", action="store_true",
+                        help="Inserta en SCRAP las páginas válidas que no tienen fila")
+    args = parser.parse_args()
+
+    if not args.cache:
+        parser.error("indica --cache o define CACHE_HTML_DIR")
+    cache = CacheHtml(args.cache)
+
+    print(f"🔁 Re-extrayendo desde {args.cache} con {args.procesos} procesos...")
+    inicio = time.time()
+    stats = reextraer(cache, args.procesos, args.simular, args.insertar_nuevas)
+    segundos = time.time() - inicio
+
+    print(f"   📄 Páginas en caché: {stats['paginas']}")
+    print(f"   ✅ Válidas: {stats['validas']}  ❌ No válidas: {stats['no_validas']}")
+    if not args.simular:
+        print(f"   ✏️ Actualizadas: {stats['actualizadas']}  = Sin cambios o sin fila: {stats['sin_cambios']}")
+        print(f"   ⚠️ Título duplicado: {stats['conflictos']}  ➕ Nuevas: {stats['nuevas']}")
+    print(f"   ⏱️ {segundos:.1f}s ({stats['paginas'] / max(segundos, 1e-9):.0f} páginas/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,8 @@
 
 import time
 import schedule
-import requests
-from bs4 import BeautifulSoup
 import mysql.connector
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 import logging
 from datetime import datetime, timedelta
 import json
@@ -13,6 +11,17 @@ import sys
 import signal
 import threading
 from config import DatabaseConfig
+from db.indice_urls import indice_urls
+from db.mysql_io import insertar_noticia
+from db.validadores_http import cargar_validador, guardar_validador
+from db import frontera_crawl
+from utils.codificacion import encoding_de_respuesta
+from utils.http_client import obtener_sesion, cerrar_sesion, cabeceras_condicionales, descargar_html
+from utils.rate_limiter import limitador_para
+from utils.frontera import SEG_POR_POSICION
+from utils.cache_html import cache_html
+from utils.extraccion import crear_soup
+from utils.canonical import canonica_declarada, canonizar, host_base
 
 # Configuración de logging
 logging.basicConfig(
@@ -32,10 +41,10 @@ class ScrapingDaemon:
     def __init__(self):
         self.running = True
         self.config = self.load_config()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        # Sesión compartida con el crawler de la app (keep-alive por host)
+        self.session = obtener_sesion()
+        # Resultado de cada descarga para la frontera persistente (se escribe por lotes)
+        self.registro_frontera = frontera_crawl.RegistroFrontera()
         
         # Configurar manejadores de señales
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -94,23 +103,13 @@ class ScrapingDaemon:
         try:
             logger.info(f"Iniciando scraping de: {url}")
             
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
+            enlaces_validos = self.enlaces_de_portada(url)
             
-            soup = BeautifulSoup(response.text, "html.parser")
-            enlaces = soup.find_all("a", href=True)
+            # Descartar duplicados y artículos que ya están en SCRAP
+            enlaces_validos = indice_urls.filtrar_nuevas(list(dict.fromkeys(enlaces_validos)))
+            enlaces_validos = self.enlaces_de_frontera(url, enlaces_validos)
             
-            # Filtrar enlaces válidos
-            enlaces_validos = []
-            for enlace in enlaces[:self.config.get('max_noticias_scraping', 50)]:
-                link = enlace["href"]
-                full_link = urljoin(url, link)
-                
-                # Filtros mejorados
-                if self.is_valid_news_link(full_link):
-                    enlaces_validos.append(full_link)
-            
-            logger.info(f"Encontrados {len(enlaces_validos)} enlaces válidos")
+            logger.info(f"Encontrados {len(enlaces_validos)} enlaces válidos nuevos")
             
             # Procesar cada enlace
             noticias = []
@@ -124,14 +123,14 @@ class ScrapingDaemon:
                         if self.config.get('modo_debug'):
                             logger.debug(f"Noticia procesada: {noticia[0][:50]}...")
                         
-                        # Pausa entre requests para ser respetuoso
-                        time.sleep(1)
-                        
                 except Exception as e:
                     if self.config.get('modo_debug'):
                         logger.warning(f"Error procesando {link}: {e}")
                     continue
             
+            self.registro_frontera.vaciar()
+            indice_urls.vaciar()
+            
             # Guardar noticias
             if noticias:
                 noticias_nuevas = self.guardar_noticias(noticias)
@@ -153,6 +152,54 @@ class ScrapingDaemon:
             
             return 0
     
+    def enlaces_de_portada(self, url):
+        """Enlaces de noticias de la portada; si no cambió (304) se reutilizan los del ciclo anterior"""
+        # Fila propia del daemon: guarda una lista de URLs, la app guarda filas de FronteraFrescura
+        validador = cargar_validador(url, consumidor="daemon")
+        response = self.session.get(url, timeout=15, headers=cabeceras_condicionales(validador))
+        if response.status_code == 304 and validador:
+            logger.info("Portada sin cambios (304), se reutilizan los enlaces anteriores")
+            return list(validador["enlaces"])
+        response.raise_for_status()
+        
+        soup = crear_soup(response.content, encoding_de_respuesta(url, response.content, response.headers))
+        enlaces = soup.find_all("a", href=True)
+        
+        # Filtrar enlaces válidos
+        enlaces_validos = []
+        for enlace in enlaces[:self.config.get('max_noticias_scraping', 50)]:
+            link = enlace["href"]
+            full_link = urljoin(url, link)
+            
+            # Filtros mejorados
+            if self.is_valid_news_link(full_link):
+                # Sin AMP, host móvil ni parámetros de seguimiento
+                enlaces_validos.append(canonizar(full_link, url))
+        
+        guardar_validador(url, response.headers.get("ETag"), response.headers.get("Last-Modified"), enlaces_validos,
+                          consumidor="daemon")
+        return enlaces_validos
+    
+    def enlaces_de_frontera(self, url, enlaces):
+        """
+        Encola los enlaces en la frontera persistente y devuelve los pendientes de la fuente:
+        lo que quedó de un ciclo cortado (reinicio del daemon) se retoma en vez de perderse.
+        Sin base de datos se devuelven los enlaces tal cual.
+        """
+        # Misma clave de fuente que la app (_dominio): app y daemon comparten las filas de la frontera
+        fuente = host_base(urlparse(url).netloc)
+        ahora = time.time()
+        # Prioridad: orden en la portada (como la frontera de la app), lo de arriba es lo más nuevo
+        if not frontera_crawl.encolar(fuente, [(u, ahora - i * SEG_POR_POSICION) for i, u in enumerate(enlaces)]):
+            return enlaces
+        pendientes = frontera_crawl.pendientes(fuente, self.config.get('max_noticias_scraping', 50))
+        if pendientes is None:
+            return enlaces
+        nuevos = indice_urls.filtrar_nuevas(pendientes)
+        vistos = set(nuevos)
+        frontera_crawl.marcar([u for u in pendientes if u not in vistos], "hecho")
+        return nuevos
+    
     def is_valid_news_link(self, link):
         """Verificar si un enlace es válido para noticias"""
         # Filtros de exclusión
@@ -176,10 +223,27 @@ class ScrapingDaemon:
     def procesar_noticia(self, url):
         """Procesar una noticia individual"""
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+            # El ritmo lo marca el limitador del host (se adapta a 429/503 y Retry-After)
+            limitador = limitador_para(url)
+            limitador.adquirir()
+            try:
+                # Streaming acotado: solo HTML (los binarios se descartan), hasta MAX_BYTES_PAGINA
+                response = descargar_html(url, timeout=10, sesion=self.session)
+            except Exception:
+                limitador.liberar(None)
+                self.registro_frontera.reintentar(url)
+                raise
+            limitador.liberar(response.status, response.headers.get("Retry-After"))
+            if response.status == 429 or response.status >= 500:
+                self.registro_frontera.reintentar(url)
+                return None
+            if response.contenido is None:
+                self.registro_frontera.descartar(url)
+                return None
+            cache_html.guardar(url, response.contenido, response.encoding)
+            indice_urls.registrar_canonica(url, canonica_declarada(response.contenido, url))
             
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = crear_soup(response.contenido, response.encoding)
             
             # Extraer datos
             titulo = self.extraer_titulo(soup)
@@ -190,6 +254,7 @@ class ScrapingDaemon:
             
             # Validar noticia
             if not titulo or not contenido or len(contenido) < 100:
+                self.registro_frontera.descartar(url)
                 return None
             
             # Limpiar y validar datos
@@ -349,21 +414,20 @@ class ScrapingDaemon:
             cursor.execute("SELECT titulo FROM SCRAP WHERE activa = TRUE")
             existentes = set([row[0] for row in cursor.fetchall()])
             
-            sql = """INSERT INTO SCRAP (titulo, fecha, categoria, contenido, imagen, url_original) 
-                     VALUES (%s, %s, %s, %s, %s, %s)"""
-            
             insertados = 0
             for noticia in noticias:
                 if noticia[0] not in existentes:
                     try:
-                        cursor.execute(sql, noticia)
+                        insertar_noticia(cursor, noticia)
                         insertados += 1
                     except mysql.connector.IntegrityError:
-                        continue
+                        pass
+                indice_urls.agregar(noticia[5])
             
             connection.commit()
             cursor.close()
             connection.close()
+            frontera_crawl.marcar([noticia[5] for noticia in noticias], "hecho")
             
             return insertados
             
@@ -415,6 +479,12 @@ class ScrapingDaemon:
             WHERE fecha_scraping < DATE_SUB(NOW(), INTERVAL 30 DAY)
             """)
             
+            # Frontera de crawl: lo que lleva más de una semana ya no se reanuda
+            cursor.execute("""
+            DELETE FROM crawl_frontera 
+            WHERE fecha_creacion < DATE_SUB(NOW(), INTERVAL 7 DAY)
+            """)
+            
             # Marcar noticias muy antiguas como inactivas (más de 90 días)
             cursor.execute("""
             UPDATE SCRAP 
@@ -459,6 +529,7 @@ class ScrapingDaemon:
                 logger.error(f"Error en loop principal: {e}")
                 time.sleep(5)
         
+        cerrar_sesion()
         logger.info("Daemon detenido")
 
 def main():
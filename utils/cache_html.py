@@ -0,0 +1,123 @@
+# utils/cache_html.py - Caché en disco del HTML descargado (comprimido, por hash de URL, con tope LRU)
+import gzip
+import json
+import os
+import threading
+import time
+from hashlib import sha1
+from pathlib import Path
+
+# Directorio de la caché; sin definir la caché está apagada
+DIRECTORIO = os.environ.get("CACHE_HTML_DIR")
+# Tamaño máximo en disco (MB); al pasarlo se borran las páginas usadas hace más tiempo
+MAX_MB = int(os.environ.get("CACHE_HTML_MAX_MB", "2048"))
+# Al desalojar se baja hasta esta fracción del tope, para no desalojar en cada escritura
+FRACCION_TRAS_DESALOJO = 0.9
+
+
+class CacheHtml:
+    """
+    Páginas guardadas como <dir>/<ab>/<sha1(url)>.gz. Cada archivo es una línea JSON
+    con url, encoding y fecha, seguida de los bytes originales de la página.
+    El orden LRU es el mtime del archivo (leer() lo actualiza).
+    """
+
+    def __init__(self, directorio=DIRECTORIO, max_mb=MAX_MB):
+        self.directorio = Path(directorio) if directorio else None
+        self.max_bytes = max_mb * 1024 * 1024
+        self._tamanios = None
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def activa(self):
+        return self.directorio is not None
+
+    def _ruta(self, url):
+        h = sha1(url.encode("utf-8")).hexdigest()
+        return self.directorio / h[:2] / f"{h}.gz"
+
+    def rutas(self):
+        return self.directorio.glob("*/*.gz") if self.activa else []
+
+    def _indexar(self):
+        """Tamaño de cada archivo, leído del disco la primera vez que hace falta"""
+        if self._tamanios is None:
+            self._tamanios = {}
+            for ruta in self.rutas():
+                try:
+                    self._tamanios[ruta] = ruta.stat().st_size
+                except OSError:
+                    continue
+            self._total = sum(self._tamanios.values())
+
+    def guardar(self, url, contenido, encoding=None):
+        if not self.activa or not contenido:
+            return
+        ruta = self._ruta(url)
+        cabecera = json.dumps({"url": url, "encoding": encoding, "fecha": time.time()}, ensure_ascii=False)
+        datos = gzip.compress(cabecera.encode("utf-8") + b"\n" + contenido, compresslevel=6)
+        try:
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            temporal = ruta.with_suffix(f".{threading.get_ident()}.tmp")
+            temporal.write_bytes(datos)
+            os.replace(temporal, ruta)
+        except OSError as e:
+            print(f"[CACHE] Error guardando {url}: {e}")
+            return
+        with self._lock:
+            self._indexar()
+            self._total += len(datos) - self._tamanios.get(ruta, 0)
+            self._tamanios[ruta] = len(datos)
+            if self._total > self.max_bytes:
+                self._desalojar()
+
+    def _desalojar(self):
+        """Borra las páginas menos usadas hasta bajar del tope (con el lock tomado)"""
+        objetivo = self.max_bytes * FRACCION_TRAS_DESALOJO
+        por_uso = []
+        for ruta in self._tamanios:
+            try:
+                por_uso.append((ruta.stat().st_mtime, ruta))
+            except OSError:
+                por_uso.append((0, ruta))
+        for _, ruta in sorted(por_uso):
+            if self._total <= objetivo:
+                break
+            try:
+                ruta.unlink()
+            except OSError:
+                pass
+            self._total -= self._tamanios.pop(ruta)
+
+    @staticmethod
+    def leer_archivo(ruta):
+        """(cabecera, contenido) de un archivo de la caché"""
+        datos = gzip.decompress(ruta.read_bytes())
+        cabecera, _, contenido = datos.partition(b"\n")
+        return json.loads(cabecera), contenido
+
+    def leer(self, url):
+        """(contenido, encoding) de la página guardada o None"""
+        if not self.activa:
+            return None
+        ruta = self._ruta(url)
+        try:
+            cabecera, contenido = self.leer_archivo(ruta)
+            os.utime(ruta)
+        except (OSError, ValueError, EOFError):
+            return None
+        return contenido, cabecera.get("encoding")
+
+    def entradas(self):
+        """Recorre la caché entregando (url, contenido, encoding) de cada página"""
+        for ruta in self.rutas():
+            try:
+                cabecera, contenido = self.leer_archivo(ruta)
+            except (OSError, ValueError, EOFError):
+                continue
+            yield cabecera["url"], contenido, cabecera.get("encoding")
+
+
+# Instancia compartida por el crawler, el daemon y reextraer.py
+cache_html = CacheHtml()
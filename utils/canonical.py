@@ -0,0 +1,130 @@
+# utils/canonical.py - Forma canónica de las URLs de artículos (AMP, móvil, seguimiento, barra final)
+import re
+from hashlib import blake2b
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+# Parámetros de trackers conocidos (solo miden de dónde vino la visita). Nombres genéricos
+# como source, src, ref u origin no van: hay sitios que los usan para elegir contenido
+PARAMETROS_SEGUIMIENTO = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "igshid", "twclid", "ttclid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi",
+}
+PREFIJOS_SEGUIMIENTO = ("utm_", "pk_", "hsa_", "mtm_")
+# Parámetros que piden la variante AMP de la misma nota (?amp=1, ?outputType=amp)
+PARAMETROS_AMP = {"amp": None, "outputtype": "amp"}
+# Subdominios que sirven lo mismo que el sitio principal
+SUBDOMINIOS_ESPEJO = ("www.", "m.", "mobile.", "amp.")
+# Variantes AMP de la ruta: /nota/amp/, /amp/nota/, /nota.amp, /nota.amp.html, /nota/amp.html
+_RE_AMP = [
+    (re.compile(r"/amp/?$", re.I), "/"),
+    (re.compile(r"^/amp(/|$)", re.I), "/"),
+    (re.compile(r"\.amp(\.html?)?$", re.I), r"\1"),
+    (re.compile(r"/amp\.html?$", re.I), "/"),
+]
+# Slug "rico" (5+ palabras o id numérico largo): identifica la nota dentro de su sección
+_RE_ID_NOTA = re.compile(r"\d{5,}")
+# Sello de fecha AAAAMMDD ("20240315"): lo comparten todas las notas del día, no es un id
+_RE_SELLO_FECHA = re.compile(r"(?:19|20)\d{2}(?:0[1-9]|1[0-2])(?:0[1-9]|[12]\d|3[01])")
+# <link rel="canonical" href="..."> (los atributos pueden venir en cualquier orden)
+_RE_LINK_CANONICAL = re.compile(rb"<link\b[^>]*\brel\s*=\s*[\"']?canonical[\"']?[^>]*>", re.I)
+_RE_HREF = re.compile(rb"\bhref\s*=\s*[\"']([^\"']+)[\"']", re.I)
+# Bytes del principio de la página donde se busca el canonical (va en el <head>)
+BYTES_HEAD = 64 * 1024
+
+
+def host_base(host):
+    """Host sin puerto, en minúsculas y sin subdominio espejo (www., m., amp.)"""
+    host = (host or "").lower().split(":", 1)[0]
+    for prefijo in SUBDOMINIOS_ESPEJO:
+        if host.startswith(prefijo) and host.count(".") > 1:
+            return host[len(prefijo):]
+    return host
+
+
+def clave_fuente(url):
+    """Clave normalizada de la fuente de una URL ("andina.pe"), la de SCRAP.fuente"""
+    return host_base(urlparse(url or "").netloc) or None
+
+
+def _es_parametro_amp(k, v):
+    if k not in PARAMETROS_AMP:
+        return False
+    valor = PARAMETROS_AMP[k]
+    return valor is None or v.lower() == valor
+
+
+def _limpiar_query(query):
+    params = [
+        (k, v) for k, v in parse_qsl(query, keep_blank_values=True)
+        if k.lower() not in PARAMETROS_SEGUIMIENTO and not k.lower().startswith(PREFIJOS_SEGUIMIENTO)
+        and not _es_parametro_amp(k.lower(), v)
+    ]
+    return urlencode(sorted(params))
+
+
+def _quitar_amp(ruta):
+    for patron, reemplazo in _RE_AMP:
+        nueva = patron.sub(reemplazo, ruta)
+        if nueva != ruta:
+            return nueva or "/"
+    return ruta
+
+
+def canonizar(url, base_url=None):
+    """
+    URL que se descarga:
+    - sin fragmento, sin parámetros de seguimiento y sin la variante AMP de la ruta
+    - si es un espejo del sitio de base_url (http, m., amp., www.), con su esquema y host
+    """
+    u = urlparse(url)
+    esquema, netloc = u.scheme.lower(), u.netloc.lower()
+    if base_url:
+        b = urlparse(base_url)
+        if host_base(netloc) == host_base(b.netloc):
+            esquema, netloc = b.scheme, b.netloc.lower()
+    ruta = re.sub(r"/{2,}", "/", _quitar_amp(u.path or "/"))
+    return urlunparse((esquema, netloc, ruta, "", _limpiar_query(u.query), ""))
+
+
+def _tiene_id_nota(slug):
+    """True si el slug trae un número largo que no es un sello de fecha"""
+    return any(not _RE_SELLO_FECHA.fullmatch(n) for n in _RE_ID_NOTA.findall(slug))
+
+
+def clave(url):
+    """
+    Clave de deduplicación: host base + ruta sin barra final (el esquema no cuenta).
+    Si el último tramo es un slug de 5+ palabras o trae un id numérico largo (no una
+    fecha AAAAMMDD), la clave es host + sección (primer tramo) + slug: la misma nota con o sin los tramos
+    intermedios (fecha, subsección) da la misma clave, pero no en otra sección.
+    """
+    u = urlparse(url)
+    host = host_base(u.netloc)
+    ruta = _quitar_amp(u.path or "/").rstrip("/").lower()
+    tramos = ruta.strip("/").split("/")
+    slug = tramos[-1]
+    if len(tramos) > 2 and (slug.count("-") >= 4 or _tiene_id_nota(slug)):
+        ruta = f"/{tramos[0]}/{slug}"
+    query = _limpiar_query(u.query)
+    return f"{host}{ruta}" + (f"?{query}" if query else "")
+
+
+def huella(url):
+    """clave(url) como entero de 64 bits (para los índices en memoria)"""
+    return int.from_bytes(blake2b(clave(url).encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def canonica_declarada(contenido, url):
+    """href del <link rel="canonical"> de la página (absoluto), o None"""
+    if not contenido:
+        return None
+    m = _RE_LINK_CANONICAL.search(contenido[:BYTES_HEAD])
+    if not m:
+        return None
+    href = _RE_HREF.search(m.group(0))
+    if not href:
+        return None
+    try:
+        return urljoin(url, href.group(1).decode("utf-8").strip())
+    except UnicodeDecodeError:
+        return None
@@ -0,0 +1,73 @@
+# utils/codificacion.py - Decisión de charset a partir de los bytes (sin adivinar sobre todo el cuerpo)
+import codecs
+import re
+import threading
+from urllib.parse import urlparse
+
+# Bytes del principio de la página donde se busca <meta charset>
+BYTES_META = 4096
+# Charset cuando el sitio no declara nada y los bytes no son UTF-8 válido
+ENCODING_RESPALDO = "cp1252"
+
+_RE_META_CHARSET = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.I
+)
+_RE_CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.I)
+
+_por_host = {}
+_lock = threading.Lock()
+
+
+def _normalizar(nombre):
+    """Nombre canónico del codec o None si Python no lo conoce"""
+    if not nombre:
+        return None
+    try:
+        nombre = codecs.lookup(nombre.decode("ascii") if isinstance(nombre, bytes) else nombre).name
+    except (LookupError, UnicodeDecodeError):
+        return None
+    # latin-1 declarado casi siempre es windows-1252 (comillas tipográficas, €)
+    return ENCODING_RESPALDO if nombre == "latin-1" else nombre
+
+
+def charset_de_content_type(content_type):
+    m = _RE_CHARSET.search(content_type or "")
+    return _normalizar(m.group(1)) if m else None
+
+
+def charset_de_meta(contenido):
+    """Charset de <meta charset> o <meta http-equiv="Content-Type"> en el principio del documento"""
+    m = _RE_META_CHARSET.search(contenido[:BYTES_META])
+    return _normalizar(m.group(1)) if m else None
+
+
+def decidir_encoding(url, contenido, declarado=None):
+    """
+    Encoding con que se decodifican los bytes de una página, en este orden:
+    1. el charset del Content-Type
+    2. el <meta charset> del documento
+    3. lo que se decidió antes para el mismo host
+    4. UTF-8 si los bytes lo son; si no, windows-1252
+    Lo decidido en 1, 2 y 4 queda guardado para el host (un sitio usa siempre el mismo).
+    """
+    host = urlparse(url).netloc.lower()
+    encoding = declarado or charset_de_meta(contenido or b"")
+    if not encoding:
+        with _lock:
+            encoding = _por_host.get(host)
+        if encoding:
+            return encoding
+        try:
+            (contenido or b"").decode("utf-8")
+            encoding = "utf-8"
+        except UnicodeDecodeError as e:
+            # Una descarga cortada puede partir un carácter multibyte al final
+            encoding = "utf-8" if e.start >= len(contenido) - 3 else ENCODING_RESPALDO
+    with _lock:
+        _por_host[host] = encoding
+    return encoding
+
+
+def encoding_de_respuesta(url, contenido, headers):
+    """decidir_encoding con el charset de las cabeceras de una respuesta (requests o aiohttp)"""
+    return decidir_encoding(url, contenido, charset_de_content_type(headers.get("Content-Type")))
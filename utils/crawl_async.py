@@ -0,0 +1,123 @@
+# utils/crawl_async.py - Cliente HTTP asíncrono para el motor de scraping "async"
+import asyncio
+import concurrent.futures
+from collections import namedtuple
+from urllib.parse import urlparse
+
+from utils.codificacion import encoding_de_respuesta
+from utils.http_client import (
+    HEADERS,
+    MAX_BYTES_PAGINA,
+    TAM_BLOQUE_HTML,
+    DescargaHtml,
+    LectorAcotado,
+    descargar_html,
+    es_tipo_html,
+    obtener_sesion,
+)
+
+try:
+    # aiohttp es opcional: sin él las descargas van al pool de hilos con la sesión compartida
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Requests simultáneos en todo el motor
+MAX_EN_VUELO = 256
+# Requests simultáneos contra un mismo host
+MAX_POR_HOST = 24
+
+# contenido son los bytes del cuerpo; se decodifican con utils.codificacion, no con la detección de aiohttp
+RespuestaAsync = namedtuple("RespuestaAsync", ["status", "url", "contenido", "headers"])
+
+
+class ClienteAsync:
+    """
+    Cliente GET asíncrono con límite global y por host.
+    Uso:
+        async with ClienteAsync() as cliente:
+            r = await cliente.get(url)
+    get() devuelve RespuestaAsync y get_html() una DescargaHtml acotada
+    (ver utils.http_client.descargar_html); None si hubo un error de red.
+    """
+
+    def __init__(self, max_en_vuelo=MAX_EN_VUELO, max_por_host=MAX_POR_HOST, timeout=15):
+        self.max_en_vuelo = max_en_vuelo
+        self.max_por_host = max_por_host
+        self.timeout = timeout
+        self._global = None
+        self._por_host = {}
+        self._sesion = None
+        self._executor = None
+
+    async def __aenter__(self):
+        self._global = asyncio.Semaphore(self.max_en_vuelo)
+        if aiohttp is not None:
+            conector = aiohttp.TCPConnector(
+                limit=self.max_en_vuelo,
+                limit_per_host=self.max_por_host,
+                ttl_dns_cache=300,
+            )
+            self._sesion = aiohttp.ClientSession(headers=HEADERS, connector=conector)
+        else:
+            obtener_sesion(self.max_por_host)
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_en_vuelo)
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._sesion is not None:
+            await self._sesion.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _semaforo_host(self, host):
+        sem = self._por_host.get(host)
+        if sem is None:
+            sem = self._por_host[host] = asyncio.Semaphore(self.max_por_host)
+        return sem
+
+    async def get(self, url, timeout=None, headers=None):
+        host = urlparse(url).netloc.lower()
+        timeout = timeout or self.timeout
+        async with self._global, self._semaforo_host(host):
+            try:
+                if self._sesion is not None:
+                    async with self._sesion.get(
+                        url, timeout=aiohttp.ClientTimeout(total=timeout), headers=headers
+                    ) as resp:
+                        contenido = await resp.read()
+                        return RespuestaAsync(resp.status, str(resp.url), contenido, resp.headers)
+                loop = asyncio.get_running_loop()
+                resp = await loop.run_in_executor(
+                    self._executor, lambda: obtener_sesion().get(url, timeout=timeout, headers=headers)
+                )
+                return RespuestaAsync(resp.status_code, resp.url, resp.content, resp.headers)
+            except Exception:
+                return None
+
+    async def get_html(self, url, timeout=None, max_bytes=MAX_BYTES_PAGINA):
+        host = urlparse(url).netloc.lower()
+        timeout = timeout or self.timeout
+        async with self._global, self._semaforo_host(host):
+            try:
+                if self._sesion is None:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(
+                        self._executor, lambda: descargar_html(url, timeout, max_bytes)
+                    )
+                async with self._sesion.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                    content_type = resp.headers.get("Content-Type", "")
+                    if resp.status != 200 or not es_tipo_html(content_type):
+                        return DescargaHtml(resp.status, str(resp.url), None, None, resp.headers, False)
+                    lector = LectorAcotado(max_bytes)
+                    async for bloque in resp.content.iter_chunked(TAM_BLOQUE_HTML):
+                        if not lector.alimentar(bloque):
+                            break
+                    if lector.binario:
+                        return DescargaHtml(resp.status, str(resp.url), None, None, resp.headers, False)
+                    datos = lector.datos
+                    return DescargaHtml(resp.status, str(resp.url), datos,
+                                        encoding_de_respuesta(str(resp.url), datos, resp.headers),
+                                        resp.headers, lector.truncada)
+            except Exception:
+                return None
@@ -0,0 +1,165 @@
+# utils/datos_estructurados.py - Campos del artículo desde JSON-LD (NewsArticle) y metas OpenGraph
+import json
+import re
+import threading
+from html import unescape
+from urllib.parse import urlparse
+
+from utils.canonical import host_base
+
+CAMPOS = ("titulo", "fecha", "categoria", "contenido", "imagen")
+TIPOS_ARTICULO = {
+    "NewsArticle", "Article", "ReportageNews", "AnalysisNewsArticle", "OpinionNewsArticle",
+    "BackgroundNewsArticle", "ReviewNewsArticle", "BlogPosting", "LiveBlogPosting",
+}
+# Mismos mínimos que las heurísticas del DOM (ver RecorridoArticulo)
+MIN_TITULO = 11
+MIN_CONTENIDO = 201
+
+_RE_JSONLD = re.compile(r"<script[^>]*application/ld\+json[^>]*>(.*?)</script>", re.I | re.S)
+_RE_META = re.compile(r"<meta\b[^>]*>", re.I)
+_RE_ATRIBUTO = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+_RE_ETIQUETA = re.compile(r"<[^>]+>")
+_RE_ESPACIOS = re.compile(r"\s+")
+
+
+def _texto(html, encoding):
+    if isinstance(html, bytes):
+        return html.decode(encoding or "utf-8", errors="replace")
+    return html
+
+
+def _limpiar(valor):
+    """Texto plano: sin etiquetas, sin entidades y con los espacios colapsados"""
+    if not isinstance(valor, str):
+        return None
+    return _RE_ESPACIOS.sub(" ", unescape(_RE_ETIQUETA.sub(" ", valor))).strip() or None
+
+
+def _primero(valor):
+    return valor[0] if isinstance(valor, list) and valor else valor
+
+
+def _url_imagen(valor):
+    valor = _primero(valor)
+    if isinstance(valor, dict):
+        valor = _primero(valor.get("url") or valor.get("contentUrl"))
+    return valor.strip() if isinstance(valor, str) and valor.strip() else None
+
+
+def _metas(texto):
+    """{property/name/itemprop: content} de los <meta> (gana la primera aparición)"""
+    metas = {}
+    for m in _RE_META.finditer(texto):
+        attrs = {a.lower(): v1 or v2 or v3 for a, v1, v2, v3 in _RE_ATRIBUTO.findall(m.group(0))}
+        contenido = attrs.get("content")
+        if not contenido:
+            continue
+        for clave in ("property", "name", "itemprop"):
+            if attrs.get(clave):
+                metas.setdefault(attrs[clave], unescape(contenido))
+    return metas
+
+
+def _objetos(nodo):
+    """Recorre listas y @graph de un bloque JSON-LD"""
+    if isinstance(nodo, list):
+        for n in nodo:
+            yield from _objetos(n)
+    elif isinstance(nodo, dict):
+        yield nodo
+        if "@graph" in nodo:
+            yield from _objetos(nodo["@graph"])
+
+
+def _articulo_jsonld(texto):
+    """Primer objeto JSON-LD de tipo artículo, o None"""
+    for m in _RE_JSONLD.finditer(texto):
+        try:
+            bloque = json.loads(m.group(1).strip(), strict=False)
+        except ValueError:
+            continue
+        for obj in _objetos(bloque):
+            tipos = obj.get("@type")
+            tipos = set(tipos) if isinstance(tipos, list) else {tipos}
+            if tipos & TIPOS_ARTICULO:
+                return obj
+    return None
+
+
+def extraer_estructurados(html, encoding=None):
+    """
+    Campos del artículo declarados por el propio sitio, sin construir el árbol:
+    JSON-LD (headline, datePublished, articleSection, image, articleBody) y, para lo
+    que falte, metas og:title / article:published_time / article:section / og:image.
+    Devuelve un dict solo con los campos encontrados (fecha sin normalizar).
+    """
+    texto = _texto(html, encoding)
+    datos = {}
+    obj = _articulo_jsonld(texto) or {}
+    metas = _metas(texto)
+
+    titulo = _limpiar(_primero(obj.get("headline") or obj.get("name")))
+    if not titulo:
+        titulo = _limpiar(metas.get("og:title"))
+        sitio = metas.get("og:site_name")
+        if titulo and sitio:
+            # "Titular | Medio" o "Titular - Medio"
+            for sep in (" | ", " - ", " – ", " — "):
+                if titulo.endswith(sep + sitio):
+                    titulo = titulo[: -len(sep + sitio)].strip()
+                    break
+    if titulo and len(titulo) >= MIN_TITULO:
+        datos["titulo"] = titulo
+
+    fecha = _primero(obj.get("datePublished") or obj.get("dateCreated")) or metas.get("article:published_time")
+    if isinstance(fecha, str) and fecha.strip():
+        datos["fecha"] = fecha.strip()
+
+    categoria = _limpiar(_primero(obj.get("articleSection"))) or _limpiar(metas.get("article:section"))
+    if categoria:
+        datos["categoria"] = categoria
+
+    contenido = _limpiar(obj.get("articleBody"))
+    if contenido and len(contenido) >= MIN_CONTENIDO:
+        datos["contenido"] = contenido
+
+    imagen = _url_imagen(obj.get("image")) or _url_imagen(metas.get("og:image"))
+    if imagen:
+        datos["imagen"] = imagen
+    return datos
+
+
+class EstadisticasEstructurados:
+    """Por fuente: páginas parseadas, cuántas trajeron cada campo estructurado y cuántas no necesitaron DOM"""
+
+    def __init__(self):
+        self._por_fuente = {}
+        self._lock = threading.Lock()
+
+    def anotar(self, url, campos, sin_dom):
+        fuente = host_base(urlparse(url).netloc)
+        with self._lock:
+            s = self._por_fuente.setdefault(fuente, dict.fromkeys(("paginas", "sin_dom") + CAMPOS, 0))
+            s["paginas"] += 1
+            s["sin_dom"] += int(sin_dom)
+            for campo in campos:
+                s[campo] += 1
+
+    def tasas(self, fuente):
+        """{campo: fracción de páginas con el campo estructurado, "sin_dom": ..., "paginas": n}"""
+        with self._lock:
+            s = dict(self._por_fuente.get(host_base(fuente), {}))
+        n = s.pop("paginas", 0)
+        return {"paginas": n, **{k: v / n for k, v in s.items()}} if n else {"paginas": 0}
+
+    def resumen(self, fuente):
+        t = self.tasas(fuente)
+        if not t["paginas"]:
+            return "sin páginas"
+        campos = ", ".join(f"{c} {t[c]:.0%}" for c in CAMPOS)
+        return f"{campos}; sin DOM {t['sin_dom']:.0%} ({t['paginas']} páginas)"
+
+
+# Instancia única del proceso
+estadisticas_estructurados = EstadisticasEstructurados()
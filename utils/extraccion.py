@@ -0,0 +1,439 @@
+# utils/extraccion.py - Extracción de título, fecha, categoría, contenido e imagen de un artículo
+# (sin dependencias de Streamlit: la usan la app, el re-extractor y los procesos de parseo)
+import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from utils.datos_estructurados import CAMPOS, estadisticas_estructurados, extraer_estructurados
+from utils.plantillas import plantillas_extraccion
+
+# Backend de BeautifulSoup: lxml (C, varias veces más rápido); html.parser queda de respaldo
+PARSER_HTML = os.environ.get("PARSER_HTML", "lxml")
+PARSER_RESPALDO = "html.parser"
+
+
+def crear_soup(html, encoding=None, parser=None):
+    """
+    BeautifulSoup del HTML (str, o bytes con su encoding ya decidido) con el backend rápido.
+    Si el backend no está instalado, falla o devuelve un árbol vacío, se usa html.parser.
+    """
+    parser = parser or PARSER_HTML
+    from_encoding = encoding if isinstance(html, bytes) else None
+    if parser != PARSER_RESPALDO:
+        try:
+            soup = BeautifulSoup(html, parser, from_encoding=from_encoding)
+            if soup.find() is not None:
+                return soup
+        except Exception:
+            # lxml no instalado (FeatureNotFound) o documento que no pudo parsear
+            pass
+    return BeautifulSoup(html, PARSER_RESPALDO, from_encoding=from_encoding)
+
+
+# Reglas de los extractores, en orden de prioridad. Cada selector se evalúa sobre
+# su primera coincidencia en el documento (como select_one / find):
+#   "h1"      etiqueta          ".x"  clase exacta          "#content"  id
+#   "*title"  [class*='title']  "a.cat"  <a rel="category tag">
+#   "x img"   <img> dentro de la clase x   "article img"  article img:first-of-type
+#   ("meta", atributo, valor)
+SELECTORES_TITULO = ["h1", ".entry-title", ".post-title", "*title", "title"]
+METAS_FECHA = [
+    ("meta", "property", "article:published_time"),
+    ("meta", "name", "article:published_time"),
+    ("meta", "name", "pubdate"),
+    ("meta", "name", "date"),
+    ("meta", "itemprop", "datePublished"),
+]
+SELECTORES_CATEGORIA = ["a.cat", ".category", ".tag", "*cat"]
+SELECTORES_CONTENIDO = [".entry-content", ".post-content", ".article-content", ".content", "#content"]
+SELECTORES_IMAGEN = ["img.wp-post-image", ".featured-image img", ".post-thumbnail img", "article img"]
+METAS_IMAGEN = [
+    ("meta", "property", "og:image"),
+    ("meta", "name", "og:image"),
+    ("meta", "name", "twitter:image"),
+    ("meta", "property", "twitter:image"),
+]
+
+_ETIQUETAS = {"h1", "title", "time", "article"}
+_CLASES = {"entry-title", "post-title", "category", "tag",
+           "entry-content", "post-content", "article-content", "content"}
+_CLASES_IMAGEN = {"featured-image", "post-thumbnail"}
+_METAS = {(attr, valor) for _, attr, valor in METAS_FECHA + METAS_IMAGEN}
+# Los primeros párrafos que usa el respaldo de extrae_mejor_texto
+MAX_PARRAFOS = 10
+
+
+def _con_ancestro(img, condicion):
+    return any(condicion(padre) for padre in img.parents)
+
+
+def _predicado(selector):
+    """Función el -> bool equivalente a un selector de las reglas (para la búsqueda directa)"""
+    if isinstance(selector, tuple):
+        _, attr, valor = selector
+        return lambda el: el.name == "meta" and el.get(attr) == valor
+    if selector in _ETIQUETAS:
+        return lambda el: el.name == selector
+    if selector == "a.cat":
+        return lambda el: el.name == "a" and " ".join(el.get("rel") or ()) == "category tag"
+    if selector == "#content":
+        return lambda el: el.get("id") == "content"
+    if selector.startswith("*"):
+        parte = selector[1:]
+        return lambda el: parte in " ".join(el.get("class") or ())
+    if selector == "img.wp-post-image":
+        return lambda el: el.name == "img" and "wp-post-image" in (el.get("class") or ())
+    if selector == "article img":
+        return lambda el: (el.name == "img" and el.find_previous_sibling("img") is None
+                           and _con_ancestro(el, lambda p: p.name == "article"))
+    if selector.endswith(" img"):
+        clase = selector[1:-4]
+        return lambda el: el.name == "img" and _con_ancestro(el, lambda p: clase in (p.get("class") or ()))
+    clase = selector[1:]
+    return lambda el: clase in (el.get("class") or ())
+
+
+class RecorridoArticulo:
+    """
+    Candidatos de todos los extractores juntados en un solo recorrido del árbol:
+    la primera coincidencia de cada selector de las reglas de arriba y los
+    primeros párrafos. Los extractores después solo aplican la prioridad sobre
+    esos candidatos (el texto se saca únicamente del candidato elegido).
+
+    Con una plantilla del dominio ({campo: selector}, ver utils/plantillas.py) cada
+    campo se busca primero directamente con su selector aprendido; el recorrido
+    completo solo se hace si alguno falla. ganadores y fallos quedan para aprender.
+    """
+
+    def __init__(self, soup, plantilla=None):
+        self.soup = soup
+        self.plantilla = plantilla or {}
+        self.primero = {}
+        self.parrafos = []
+        self.recorrido = False
+        self.ganadores = {}
+        self.fallos = set()
+        self._directos = None
+
+    def _anotar(self, selector, el):
+        if selector not in self.primero:
+            self.primero[selector] = el
+
+    def _recorrer(self):
+        if self.recorrido:
+            return
+        self.recorrido = True
+        for el in self.soup.descendants:
+            nombre = el.name
+            if nombre is None:
+                continue
+            if nombre in _ETIQUETAS:
+                self._anotar(nombre, el)
+            elif nombre == "p":
+                if len(self.parrafos) < MAX_PARRAFOS:
+                    self.parrafos.append(el)
+            elif nombre == "meta":
+                for attr in ("property", "name", "itemprop"):
+                    valor = el.get(attr)
+                    if valor and (attr, valor) in _METAS:
+                        self._anotar(("meta", attr, valor), el)
+            elif nombre == "a":
+                if " ".join(el.get("rel") or ()) == "category tag":
+                    self._anotar("a.cat", el)
+            elif nombre == "img":
+                self._imagen(el)
+
+            clases = el.get("class")
+            if clases:
+                for c in clases:
+                    if c in _CLASES:
+                        self._anotar("." + c, el)
+                unidas = " ".join(clases)
+                if "title" in unidas:
+                    self._anotar("*title", el)
+                if "cat" in unidas:
+                    self._anotar("*cat", el)
+            if el.get("id") == "content":
+                self._anotar("#content", el)
+        self.primero["parrafos"] = self.parrafos
+
+    def _imagen(self, img):
+        if "wp-post-image" in (img.get("class") or ()):
+            self._anotar("img.wp-post-image", img)
+        pendientes = {".featured-image img", ".post-thumbnail img", "article img"} - self.primero.keys()
+        if not pendientes:
+            return
+        for padre in img.parents:
+            if padre.name == "article" and "article img" in pendientes:
+                # :first-of-type: ningún <img> hermano antes
+                if img.find_previous_sibling("img") is None:
+                    self._anotar("article img", img)
+            for c in padre.get("class") or ():
+                if c in _CLASES_IMAGEN:
+                    self._anotar(f".{c} img", img)
+
+    def _directo(self, selector):
+        """Coincidencia del selector aprendido (todos los de la plantilla se buscan en una pasada)"""
+        if self._directos is None:
+            self._directos = self._buscar(set(self.plantilla.values()))
+        return self._directos.get(selector)
+
+    def _buscar(self, selectores):
+        """
+        Primera coincidencia de cada selector en un recorrido que se corta en cuanto
+        aparecen todos: en un dominio conocido suele bastar con la parte de arriba del árbol.
+        """
+        predicados = {sel: _predicado(sel) for sel in selectores if sel != "parrafos"}
+        parrafos = [] if "parrafos" in selectores else None
+        encontrados = {}
+        for el in self.soup.descendants:
+            if el.name is None:
+                continue
+            for sel, predicado in list(predicados.items()):
+                if predicado(el):
+                    encontrados[sel] = el
+                    del predicados[sel]
+            if parrafos is not None and el.name == "p" and len(parrafos) < MAX_PARRAFOS:
+                parrafos.append(el)
+            if not predicados and (parrafos is None or len(parrafos) >= MAX_PARRAFOS):
+                break
+        if parrafos is not None:
+            encontrados["parrafos"] = parrafos
+        return encontrados
+
+    def _resolver(self, campo, selectores, valor_de):
+        """
+        Valor del campo: primero con el selector de la plantilla; si no hay o no sirve,
+        con la prioridad completa sobre los candidatos del recorrido. None si ninguno sirve.
+        """
+        aprendido = self.plantilla.get(campo)
+        if aprendido is not None:
+            valor = valor_de(aprendido, self._directo(aprendido))
+            if valor is not None:
+                self.ganadores[campo] = aprendido
+                return valor
+            self.fallos.add(campo)
+        self._recorrer()
+        for selector in selectores:
+            valor = valor_de(selector, self.primero.get(selector))
+            if valor is not None:
+                self.ganadores[campo] = selector
+                return valor
+        return None
+
+    @staticmethod
+    def _titulo_de(selector, el):
+        if el:
+            title = el.get_text(strip=True)
+            if len(title) > 10:
+                return title
+        return None
+
+    @staticmethod
+    def _fecha_de(selector, el):
+        if not el:
+            return None
+        if selector == "time":
+            v = el.get("datetime") or el.get_text(strip=True)
+        elif el.get("content"):
+            v = el["content"]
+        else:
+            return None
+        return _parse_datetime(v) or None
+
+    @staticmethod
+    def _categoria_de(selector, el):
+        return el.get_text(strip=True) if el else None
+
+    def _contenido_de(self, selector, el):
+        if not el:
+            return None
+        if selector == "parrafos":
+            txt = " ".join(p.get_text(" ", strip=True) for p in el)
+            return txt if len(txt) > 150 else None
+        txt = el.get_text(" ", strip=True)
+        return txt if len(txt) > 200 else None
+
+    def titulo(self):
+        return self._resolver("titulo", SELECTORES_TITULO, self._titulo_de)
+
+    def fecha(self):
+        dt = self._resolver("fecha", ["time"] + METAS_FECHA, self._fecha_de)
+        # fallback: now UTC
+        return dt or datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
+
+    def categoria(self):
+        return self._resolver("categoria", SELECTORES_CATEGORIA, self._categoria_de) or "General"
+
+    def contenido(self):
+        """Contenido LIMPIO (sin HTML): article, contenedores de contenido, primeros párrafos"""
+        txt = self._resolver("contenido", ["article"] + SELECTORES_CONTENIDO + ["parrafos"], self._contenido_de)
+        # ÚLTIMO: Todo el body como fallback (SOLO TEXTO)
+        return txt if txt is not None else self.soup.get_text(" ", strip=True)[:1000]
+
+    def imagen(self, base_url):
+        def _imagen_de(selector, el):
+            if not el:
+                return None
+            if isinstance(selector, tuple):
+                return urljoin(base_url, el["content"]) if el.get("content") else None
+            return urljoin(base_url, el["src"]) if el.get("src") else None
+        return self._resolver("imagen", SELECTORES_IMAGEN + METAS_IMAGEN, _imagen_de)
+
+
+def extraer_titulo(soup):
+    """Extraer título LIMPIO (sin HTML)"""
+    return RecorridoArticulo(soup).titulo()
+
+def _parse_datetime(s):
+    try:
+        # RFC2822
+        dt = parsedate_to_datetime(s)
+        return dt.astimezone(timezone.utc).isoformat()
+    except:
+        pass
+    # otros intentos simples...
+    try:
+        return pd.to_datetime(s, errors="coerce", utc=True).isoformat()
+    except:
+        return None
+
+_RE_HACE = re.compile(r"hace\s+(\d+|un|una)\s+(minuto|hora|d[ií]a|semana)", re.I)
+_UNIDADES_HACE = {"minuto": "minutes", "hora": "hours", "dia": "days", "día": "days", "semana": "weeks"}
+
+
+def fecha_publicacion(fecha, respaldo=None):
+    """
+    Fecha extraída (ISO, RFC 2822, "hace 3 horas"...) como datetime UTC sin tzinfo, para la
+    columna SCRAP.fecha_publicacion. Si no se entiende o cae en el futuro, respaldo
+    (por defecto ahora): la noticia se ordena como recién publicada.
+    """
+    ahora = datetime.utcnow()
+    respaldo = respaldo or ahora
+    if not fecha:
+        return respaldo
+    m = _RE_HACE.search(str(fecha))
+    if m:
+        cantidad = 1 if m.group(1).lower() in ("un", "una") else int(m.group(1))
+        return respaldo - timedelta(**{_UNIDADES_HACE[m.group(2).lower()]: cantidad})
+    iso = _parse_datetime(str(fecha))
+    if not iso or iso == "NaT":
+        return respaldo
+    dt = datetime.fromisoformat(iso).astimezone(timezone.utc).replace(tzinfo=None)
+    # Unos minutos de margen por relojes desfasados; más que eso es una zona horaria mal declarada
+    return respaldo if dt > ahora + timedelta(minutes=10) else dt
+
+def extraer_fecha(soup):
+    return RecorridoArticulo(soup).fecha()
+
+def extraer_categoria(soup):
+    """Extraer categoría"""
+    return RecorridoArticulo(soup).categoria()
+
+def extraer_contenido(soup):
+    """Extraer contenido del artículo"""
+    article = soup.find("article")
+    if article:
+        paragraphs = article.find_all("p")
+        content = " ".join([p.get_text(strip=True) for p in paragraphs])
+        if len(content) > 50:
+            return content
+    
+    content_selectors = [".entry-content", ".post-content", ".article-content", ".content"]
+    for selector in content_selectors:
+        elem = soup.select_one(selector)
+        if elem:
+            paragraphs = elem.find_all("p")
+            content = " ".join([p.get_text(strip=True) for p in paragraphs])
+            if len(content) > 50:
+                return content
+    
+    paragraphs = soup.find_all("p")
+    return " ".join([p.get_text(strip=True) for p in paragraphs[:10]])
+
+def extraer_imagen(soup, base_url):
+    return RecorridoArticulo(soup).imagen(base_url)
+
+def extrae_mejor_texto(soup):
+    """Extrae contenido LIMPIO (sin HTML)"""
+    return RecorridoArticulo(soup).contenido()
+
+def _parsear(html, url, encoding, parser, plantilla):
+    """
+    Núcleo de parsear_articulo sin tocar estado compartido (se puede ejecutar en otro proceso).
+    Devuelve (tupla o None, info) con info = lo que hay que anotar en este proceso (registrar_parseo).
+    """
+    datos = extraer_estructurados(html, encoding)
+    if "fecha" in datos:
+        fecha = _parse_datetime(datos["fecha"])
+        if fecha and fecha != "NaT":
+            datos["fecha"] = fecha
+        else:
+            del datos["fecha"]
+    if "imagen" in datos:
+        datos["imagen"] = urljoin(url, datos["imagen"])
+
+    sin_dom = all(c in datos for c in CAMPOS)
+    info = {"campos": list(datos), "sin_dom": sin_dom, "ganadores": {}, "fallos": set()}
+    # Un solo recorrido del árbol para los campos que falten (o ninguno si la plantilla acierta)
+    recorrido = None
+    if not sin_dom:
+        recorrido = RecorridoArticulo(crear_soup(html, encoding, parser), plantilla)
+
+    titulo = datos.get("titulo") or recorrido.titulo()
+    if not titulo or len(titulo) < 8:
+        return None, info
+
+    contenido = datos.get("contenido") or recorrido.contenido()
+    if not contenido or len(contenido) < 150:
+        return None, info
+
+    fecha = datos.get("fecha") or recorrido.fecha()
+    categoria = datos.get("categoria") or recorrido.categoria()
+    imagen = datos.get("imagen") or recorrido.imagen(url)
+
+    if recorrido is not None:
+        # Solo se aprende de artículos válidos
+        info["ganadores"], info["fallos"] = recorrido.ganadores, recorrido.fallos
+    return (titulo.strip(), fecha or "", categoria or "General", contenido.strip(), imagen, url), info
+
+
+def registrar_parseo(url, info):
+    """Anota en las estadísticas y plantillas de este proceso el resultado de un parseo"""
+    estadisticas_estructurados.anotar(url, info["campos"], info["sin_dom"])
+    if info["ganadores"] or info["fallos"]:
+        plantillas_extraccion.anotar(url, info["ganadores"], info["fallos"])
+
+
+def parsear_articulo(html, url, encoding=None, parser=None):
+    """
+    Extrae (titulo, fecha, categoria, contenido, imagen, url) del HTML; None si no es válido.
+    html pueden ser los bytes descargados con su encoding ya decidido (ver utils/codificacion.py).
+    parser: backend de BeautifulSoup (por defecto PARSER_HTML, ver crear_soup).
+    Primero se leen los datos estructurados (JSON-LD / OpenGraph); el árbol solo se
+    construye si falta algún campo, y sus heurísticas completan únicamente lo que falta
+    (probando antes los selectores aprendidos para el dominio, ver utils/plantillas.py).
+    """
+    resultado, info = _parsear(html, url, encoding, parser, plantillas_extraccion.plantilla(url))
+    registrar_parseo(url, info)
+    return resultado
+
+
+def parsear_en_proceso(html, url, encoding, plantilla):
+    """
+    parsear_articulo para un pool de procesos: la plantilla llega del proceso principal y
+    lo aprendido vuelve en info. Devuelve (tupla o None, info, segundos de CPU); si el
+    extractor falla, (None, None, segundos): una excepción del futuro es siempre del pool.
+    """
+    inicio = time.process_time()
+    try:
+        resultado, info = _parsear(html, url, encoding, None, plantilla)
+    except Exception:
+        resultado, info = None, None
+    return resultado, info, time.process_time() - inicio
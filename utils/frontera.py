@@ -0,0 +1,141 @@
+# utils/frontera.py - Frontera de URLs ordenada por frescura
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from utils.canonical import clave
+from utils.sitemap_stream import parse_fecha_w3c
+
+# Antigüedad estimada de los enlaces de listados sin fecha:
+# cada página de paginación ~medio día y cada posición dentro de la página ~5 minutos
+SEG_POR_PAGINA = 12 * 3600
+SEG_POR_POSICION = 5 * 60
+
+# Fechas dentro de la ruta: /2025/10/18/, /2025-10-18-, /20251018, /2025/10/
+_RE_FECHA_RUTA = [
+    (re.compile(r"/(20\d{2})/(\d{1,2})/(\d{1,2})(?:/|$)"), 3),
+    (re.compile(r"(?<!\d)(20\d{2})-(\d{2})-(\d{2})(?!\d)"), 3),
+    (re.compile(r"(?<!\d)(20\d{2})(\d{2})(\d{2})(?!\d)"), 3),
+    (re.compile(r"/(20\d{2})/(\d{1,2})(?:/|$)"), 2),
+]
+
+
+def parse_fecha(texto):
+    """Fecha de un feed o sitemap (RFC 2822 o ISO 8601) como datetime con zona; None si no se entiende"""
+    if not texto:
+        return None
+    try:
+        dt = parsedate_to_datetime(texto.strip())
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError, IndexError):
+        return parse_fecha_w3c(texto)
+
+
+def fecha_en_ruta(url):
+    """Fecha codificada en la ruta de la URL (mediodía UTC de ese día) o None"""
+    ruta = urlparse(url).path
+    for patron, partes in _RE_FECHA_RUTA:
+        m = patron.search(ruta)
+        if not m:
+            continue
+        try:
+            anio, mes = int(m.group(1)), int(m.group(2))
+            dia = int(m.group(3)) if partes == 3 else 1
+            return datetime(anio, mes, dia, 12, tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+class FronteraFrescura:
+    """
+    Conjunto de URLs descubiertas con sus señales de frescura:
+    - fecha: pubDate del RSS o lastmod / publication_date del sitemap
+    - fecha en la ruta (/2025/10/18/...)
+    - pagina/posicion: orden en la portada (pagina 1) o en la paginación
+    ordenadas() devuelve primero las más recientes, para gastar el
+    presupuesto de enlaces en lo último publicado.
+    Las variantes de una misma nota (misma clave canónica) se juntan en la
+    primera URL vista, sumando sus señales.
+    """
+
+    def __init__(self):
+        self._senales = {}
+        self._claves = {}
+        self._creada = time.time()
+
+    def agregar(self, url, fecha=None, pagina=None, posicion=None, origen=None):
+        """Agrega la URL (o suma señales a su variante ya vista); devuelve la URL que queda"""
+        url = self._claves.setdefault(clave(url), url)
+        s = self._senales.get(url)
+        if s is None:
+            s = self._senales[url] = {"fecha": None, "pagina": None, "posicion": None, "origenes": set()}
+        if fecha and (s["fecha"] is None or fecha > s["fecha"]):
+            s["fecha"] = fecha
+        if pagina is not None and (s["pagina"] is None or (pagina, posicion or 0) < (s["pagina"], s["posicion"] or 0)):
+            s["pagina"], s["posicion"] = pagina, posicion or 0
+        if origen:
+            s["origenes"].add(origen)
+        return url
+
+    def __ior__(self, otra):
+        for url, s in otra._senales.items():
+            url = self.agregar(url, s["fecha"], s["pagina"], s["posicion"])
+            self._senales[url]["origenes"] |= s["origenes"]
+        return self
+
+    @classmethod
+    def union(cls, fronteras):
+        total = cls()
+        for f in fronteras:
+            total |= f
+        return total
+
+    def __len__(self):
+        return len(self._senales)
+
+    def __iter__(self):
+        return iter(self._senales)
+
+    def __contains__(self, url):
+        return clave(url) in self._claves
+
+    def a_lista(self):
+        """Serialización a JSON: [[url, fecha ISO, pagina, posicion, [origenes]]]"""
+        return [
+            [u, s["fecha"].isoformat() if s["fecha"] else None, s["pagina"], s["posicion"], sorted(s["origenes"])]
+            for u, s in self._senales.items()
+        ]
+
+    @classmethod
+    def desde_lista(cls, filas):
+        urls = cls()
+        for u, fecha, pagina, posicion, origenes in filas:
+            u = urls.agregar(u, parse_fecha_w3c(fecha), pagina, posicion)
+            urls._senales[u]["origenes"].update(origenes)
+        return urls
+
+    def senales(self, url):
+        return self._senales.get(url)
+
+    def puntaje(self, url):
+        """Instante de publicación estimado (epoch); 0 si no hay ninguna señal"""
+        s = self._senales[url]
+        if s["fecha"]:
+            return s["fecha"].timestamp()
+        f = fecha_en_ruta(url)
+        if f:
+            return min(f.timestamp(), self._creada)
+        if s["pagina"] is not None:
+            return self._creada - (s["pagina"] - 1) * SEG_POR_PAGINA - s["posicion"] * SEG_POR_POSICION
+        return 0.0
+
+    def ordenadas(self):
+        """URLs de la más fresca a la más antigua (a igual frescura, las vistas en más fuentes)"""
+        return sorted(
+            self._senales,
+            key=lambda u: (self.puntaje(u), len(self._senales[u]["origenes"])),
+            reverse=True,
+        )
@@ -0,0 +1,159 @@
+# utils/http_client.py - Cliente HTTP compartido para el crawler
+import threading
+from collections import namedtuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.codificacion import encoding_de_respuesta
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Language": "es-PE,es;q=0.9,en;q=0.8"
+}
+
+# Conexiones keep-alive por host (una por worker concurrente)
+POOL_POR_HOST = 10
+# Hosts distintos cuyo pool se mantiene abierto (cubre todas las fuentes)
+HOSTS_EN_POOL = 32
+# Requests de descubrimiento (feeds, listados, sitemaps) simultáneos contra un host
+MAX_DESCUBRIMIENTO_POR_HOST = 8
+
+# Bytes que se leen como máximo de una página de artículo (galerías y videos no se bajan enteros)
+MAX_BYTES_PAGINA = 3 * 1024 * 1024
+TAM_BLOQUE_HTML = 16 * 1024
+TIPOS_HTML = ("text/html", "application/xhtml+xml", "text/plain")
+
+_lock = threading.Lock()
+_sesion = None
+_pool_actual = 0
+_adapter = None
+_semaforos_host = {}
+
+
+def _montar_adapter(sesion, pool):
+    """Monta un adapter con pool_maxsize=pool y cierra el anterior (sus conexiones quedarían abiertas)"""
+    global _adapter
+    adapter = HTTPAdapter(pool_connections=HOSTS_EN_POOL, pool_maxsize=pool, max_retries=0)
+    sesion.mount("http://", adapter)
+    sesion.mount("https://", adapter)
+    if _adapter is not None:
+        _adapter.close()
+    _adapter = adapter
+
+
+def obtener_sesion(max_workers=None):
+    """
+    Devuelve la sesión HTTP del proceso (keep-alive, HEADERS ya aplicados).
+    Si se pide un max_workers mayor que el pool actual, el pool se amplía.
+    """
+    global _sesion, _pool_actual
+    pool = max(max_workers or POOL_POR_HOST, 1)
+    with _lock:
+        if _sesion is None:
+            _sesion = requests.Session()
+            _sesion.headers.update(HEADERS)
+        if pool > _pool_actual:
+            _montar_adapter(_sesion, pool)
+            _pool_actual = pool
+        return _sesion
+
+
+def cerrar_sesion():
+    """Cierra las conexiones abiertas (al terminar el daemon)"""
+    global _sesion, _pool_actual, _adapter
+    with _lock:
+        if _sesion is not None:
+            _sesion.close()
+        _sesion = None
+        _adapter = None
+        _pool_actual = 0
+
+
+def limite_por_host(url, limite=MAX_DESCUBRIMIENTO_POR_HOST):
+    """Semáforo del proceso que acota los requests simultáneos al host de la URL"""
+    host = urlparse(url).netloc.lower()
+    with _lock:
+        sem = _semaforos_host.get(host)
+        if sem is None:
+            sem = _semaforos_host[host] = threading.BoundedSemaphore(limite)
+        return sem
+
+
+def cabeceras_condicionales(validador):
+    """If-None-Match / If-Modified-Since a partir de un validador guardado (o {} si no hay)"""
+    cabeceras = {}
+    if validador:
+        if validador.get("etag"):
+            cabeceras["If-None-Match"] = validador["etag"]
+        if validador.get("last_modified"):
+            cabeceras["If-Modified-Since"] = validador["last_modified"]
+    return cabeceras
+
+
+def es_tipo_html(content_type):
+    """True si el Content-Type es HTML (o no viene: se le da el beneficio de la duda)"""
+    if not content_type:
+        return True
+    return content_type.split(";", 1)[0].strip().lower() in TIPOS_HTML
+
+
+# Página descargada por descargar_html / ClienteAsync.get_html. contenido son los bytes leídos
+# (None si no era HTML o el status no es 200) y encoding el decidido por utils.codificacion:
+# el parser recibe los bytes y ese encoding, sin adivinar el charset sobre el cuerpo entero.
+DescargaHtml = namedtuple("DescargaHtml", ["status", "url", "contenido", "encoding", "headers", "truncada"])
+
+
+class LectorAcotado:
+    """
+    Acumula los bloques de una respuesta y dice cuándo dejar de leer: al pasar
+    max_bytes o si el primer bloque trae bytes nulos (binario servido como HTML).
+    La página se lee entera hasta el tope: el JSON-LD suele venir al final del
+    body y la caché de HTML guarda lo leído para re-extraer.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES_PAGINA):
+        self.max_bytes = max_bytes
+        self._datos = bytearray()
+        self.truncada = False
+        self.binario = False
+
+    def alimentar(self, bloque):
+        """Agrega un bloque; devuelve False cuando ya no hace falta leer más"""
+        if not self._datos and b"\x00" in bloque[:1024]:
+            self.binario = True
+            return False
+        self._datos += bloque
+        if len(self._datos) >= self.max_bytes:
+            del self._datos[self.max_bytes:]
+            self.truncada = True
+            return False
+        return True
+
+    @property
+    def datos(self):
+        return bytes(self._datos)
+
+
+def descargar_html(url, timeout=15, max_bytes=MAX_BYTES_PAGINA, sesion=None):
+    """
+    GET en streaming de una página de artículo con la sesión compartida.
+    - si el Content-Type no es HTML se corta sin leer el cuerpo (contenido None)
+    - se deja de leer al llegar a max_bytes
+    Devuelve DescargaHtml; los errores de red se propagan como en requests.
+    """
+    sesion = sesion or obtener_sesion()
+    with sesion.get(url, timeout=timeout, stream=True) as r:
+        content_type = r.headers.get("Content-Type", "")
+        if r.status_code != 200 or not es_tipo_html(content_type):
+            return DescargaHtml(r.status_code, r.url, None, None, r.headers, False)
+        lector = LectorAcotado(max_bytes)
+        for bloque in r.iter_content(TAM_BLOQUE_HTML):
+            if not lector.alimentar(bloque):
+                break
+        if lector.binario:
+            return DescargaHtml(r.status_code, r.url, None, None, r.headers, False)
+        datos = lector.datos
+        return DescargaHtml(r.status_code, r.url, datos, encoding_de_respuesta(r.url, datos, r.headers),
+                            r.headers, lector.truncada)
@@ -0,0 +1,164 @@
+# utils/pipeline_parseo.py - Parseo de artículos en un pool de procesos, separado de las descargas
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.extraccion import parsear_articulo, parsear_en_proceso, registrar_parseo
+from utils.plantillas import plantillas_extraccion
+
+# Procesos de parseo (0 = parsear en los hilos de descarga, como antes)
+PROCESOS_PARSEO = int(os.environ.get("PROCESOS_PARSEO", os.cpu_count() or 1))
+# Páginas descargadas esperando parseo por cada proceso: más allá, las descargas esperan
+EN_COLA_POR_PROCESO = 4
+# Lo devuelve resultado() cuando falló el pool y no el extractor: la página hay que parsearla en un hilo
+FALLO_POOL = object()
+
+
+class ContadoresEtapas:
+    """Páginas, bytes y tiempos de cada etapa (red y parseo) de un crawl"""
+
+    def __init__(self):
+        self.inicio = time.monotonic()
+        self.descargas = 0
+        self.bytes = 0
+        self.seg_descarga = 0.0
+        self.parseos = 0
+        self.seg_parseo = 0.0
+        self.seg_espera_cola = 0.0
+        self._lock = threading.Lock()
+
+    def descarga(self, segundos, n_bytes):
+        with self._lock:
+            self.descargas += 1
+            self.bytes += n_bytes
+            self.seg_descarga += segundos
+
+    def parseo(self, segundos):
+        with self._lock:
+            self.parseos += 1
+            self.seg_parseo += segundos
+
+    def espera(self, segundos):
+        with self._lock:
+            self.seg_espera_cola += segundos
+
+    def resumen(self):
+        total = max(time.monotonic() - self.inicio, 1e-9)
+        por_pagina = lambda seg, n: f"{seg * 1000 / n:.0f} ms/pág" if n else "-"
+        return (
+            f"red {self.descargas} págs ({self.descargas / total:.1f}/s, {self.bytes / 1048576:.1f} MB, "
+            f"{por_pagina(self.seg_descarga, self.descargas)}), "
+            f"parseo {self.parseos} págs ({self.parseos / total:.1f}/s, "
+            f"{por_pagina(self.seg_parseo, self.parseos)} CPU), "
+            f"espera por cola llena {self.seg_espera_cola:.1f}s, total {total:.1f}s"
+        )
+
+
+class PipelineParseo:
+    """
+    Segunda etapa del crawl: los hilos de descarga dejan cada página en una cola acotada
+    que consume un pool de procesos con los extractores (el parseo no compite por el GIL
+    con la red). Con la cola llena, enviar() bloquea al hilo de descarga (backpressure).
+    La plantilla del dominio viaja al proceso y lo aprendido vuelve con el resultado.
+    Si el pool no se puede usar, se parsea en el hilo que llama.
+    """
+
+    def __init__(self, procesos=PROCESOS_PARSEO, en_cola_por_proceso=EN_COLA_POR_PROCESO):
+        self.procesos = procesos
+        self.max_en_cola = max(1, procesos * en_cola_por_proceso)
+        self._cola = threading.BoundedSemaphore(self.max_en_cola)
+        self._pool = None
+        self._roto = False
+        self._lock = threading.Lock()
+
+    @property
+    def activo(self):
+        return self.procesos > 0 and not self._roto
+
+    def _obtener_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # spawn: hacer fork de un proceso con hilos (Streamlit, descargas) puede colgarse
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.procesos, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def _enviar(self, contenido, url, encoding):
+        try:
+            futuro = self._obtener_pool().submit(
+                parsear_en_proceso, contenido, url, encoding, plantillas_extraccion.plantilla(url)
+            )
+        except (BrokenProcessPool, RuntimeError, OSError) as e:
+            print(f"[CRAWL] Pool de parseo no disponible, se parsea en los hilos: {e}")
+            self._roto = True
+            self._cola.release()
+            return None
+        futuro.add_done_callback(lambda _: self._cola.release())
+        return futuro
+
+    def enviar(self, contenido, url, encoding, contadores):
+        """Future con el parseo (resolver con resultado()); None si hay que parsear en el hilo"""
+        if not self.activo:
+            return None
+        inicio = time.monotonic()
+        self._cola.acquire()
+        contadores.espera(time.monotonic() - inicio)
+        return self._enviar(contenido, url, encoding)
+
+    def resultado(self, futuro, url, contadores):
+        """
+        Tupla del artículo o None; aplica en este proceso lo aprendido por el extractor.
+        FALLO_POOL si el futuro no trae resultado (proceso caído, error al serializar):
+        la página no se descarta, el que llama la parsea con parsear_en_hilo().
+        """
+        try:
+            resultado, info, segundos = futuro.result()
+        except BrokenProcessPool as e:
+            print(f"[CRAWL] Pool de parseo caído, se parsea en los hilos: {e}")
+            self._roto = True
+            return FALLO_POOL
+        except Exception as e:
+            print(f"[CRAWL] Error del pool de parseo en {url}: {e}")
+            return FALLO_POOL
+        contadores.parseo(segundos)
+        if info is not None:
+            registrar_parseo(url, info)
+        return resultado
+
+    def parsear_en_hilo(self, contenido, url, encoding, contadores):
+        inicio = time.process_time()
+        try:
+            resultado = parsear_articulo(contenido, url, encoding)
+        except Exception:
+            resultado = None
+        contadores.parseo(time.process_time() - inicio)
+        return resultado
+
+    async def parsear_async(self, contenido, url, encoding, contadores):
+        """Para el motor asíncrono: espera turno en la cola sin bloquear el event loop"""
+        futuro = None
+        if self.activo:
+            inicio = time.monotonic()
+            while not self._cola.acquire(blocking=False):
+                await asyncio.sleep(0.01)
+            contadores.espera(time.monotonic() - inicio)
+            futuro = self._enviar(contenido, url, encoding)
+        if futuro is None:
+            return await asyncio.to_thread(self.parsear_en_hilo, contenido, url, encoding, contadores)
+        try:
+            await asyncio.wrap_future(futuro)
+        except Exception:
+            pass  # resultado() decide si falló el pool
+        resultado = self.resultado(futuro, url, contadores)
+        if resultado is FALLO_POOL:
+            return await asyncio.to_thread(self.parsear_en_hilo, contenido, url, encoding, contadores)
+        return resultado
+
+
+# Instancia única del proceso (el pool se crea con el primer artículo)
+pipeline_parseo = PipelineParseo()
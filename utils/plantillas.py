@@ -0,0 +1,79 @@
+# utils/plantillas.py - Plantillas de extracción aprendidas por dominio (qué selector sirve para cada campo)
+import threading
+from urllib.parse import urlparse
+
+from utils.canonical import host_base
+
+# Veces seguidas que un selector tiene que ganar un campo para usarse directamente
+MIN_ACIERTOS = 3
+# Fallos seguidos del selector aprendido antes de olvidarlo y volver a aprender
+MAX_FALLOS = 3
+# Respaldos que no identifican nada del sitio: no se aprenden
+NO_APRENDER = {"parrafos"}
+
+
+def _host(url):
+    return host_base(urlparse(url).netloc if "//" in url else url)
+
+
+class PlantillasExtraccion:
+    """
+    Por host y campo: el selector que ganó las últimas veces, con sus aciertos y
+    fallos seguidos. Cuando un selector acumula MIN_ACIERTOS pasa a la plantilla
+    y RecorridoArticulo lo prueba directamente; si falla MAX_FALLOS veces seguidas
+    se descarta y el campo vuelve a aprenderse con el recorrido completo.
+    """
+
+    def __init__(self):
+        self._por_host = {}
+        self._lock = threading.Lock()
+
+    def plantilla(self, url):
+        """{campo: selector} de los selectores ya confirmados para el host"""
+        with self._lock:
+            entradas = self._por_host.get(_host(url), {})
+            return {c: e["selector"] for c, e in entradas.items() if e["aciertos"] >= MIN_ACIERTOS}
+
+    def anotar(self, url, ganadores, fallos):
+        """ganadores: {campo: selector que dio el valor}; fallos: campos en que falló la plantilla"""
+        with self._lock:
+            entradas = self._por_host.setdefault(_host(url), {})
+            for campo in fallos:
+                e = entradas.get(campo)
+                if e is None:
+                    continue
+                e["fallos"] += 1
+                if e["fallos"] >= MAX_FALLOS:
+                    del entradas[campo]
+            for campo, selector in ganadores.items():
+                if campo in fallos or selector in NO_APRENDER:
+                    continue
+                e = entradas.get(campo)
+                if e and e["selector"] == selector:
+                    e["aciertos"] += 1
+                    e["fallos"] = 0
+                else:
+                    entradas[campo] = {"selector": selector, "aciertos": 1, "fallos": 0}
+
+    def exportar(self, url):
+        """Serialización a JSON: {campo: [selector, aciertos, fallos]} (selectores de meta como lista)"""
+        with self._lock:
+            entradas = self._por_host.get(_host(url), {})
+            return {c: [list(e["selector"]) if isinstance(e["selector"], tuple) else e["selector"],
+                        e["aciertos"], e["fallos"]]
+                    for c, e in entradas.items()}
+
+    def cargar(self, url, datos):
+        """Carga lo guardado por exportar(); no pisa lo aprendido ya en este proceso"""
+        host = _host(url)
+        with self._lock:
+            if host in self._por_host or not datos:
+                return
+            self._por_host[host] = {
+                c: {"selector": tuple(sel) if isinstance(sel, list) else sel, "aciertos": aciertos, "fallos": fallos}
+                for c, (sel, aciertos, fallos) in datos.items()
+            }
+
+
+# Instancia única del proceso
+plantillas_extraccion = PlantillasExtraccion()
@@ -0,0 +1,135 @@
+# utils/rate_limiter.py - Limitador adaptativo de requests por host
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Requests por segundo a un host al empezar y sus límites
+TASA_INICIAL = 5.0
+TASA_MIN = 0.2
+TASA_MAX = 50.0
+# Requests simultáneos a un host al empezar y su máximo
+CONCURRENCIA_INICIAL = 4
+CONCURRENCIA_MAX = 32
+# Pausa del host ante 429/503 sin Retry-After (se duplica con cada fallo seguido)
+PAUSA_BASE = 2.0
+PAUSA_MAX = 120.0
+
+
+def parse_retry_after(valor):
+    """Segundos indicados por Retry-After (entero o fecha HTTP); None si no viene o no se entiende"""
+    if not valor:
+        return None
+    valor = str(valor).strip()
+    if valor.isdigit():
+        return min(float(valor), PAUSA_MAX)
+    try:
+        fecha = parsedate_to_datetime(valor)
+        if fecha.tzinfo is None:
+            fecha = fecha.replace(tzinfo=timezone.utc)
+        return min(max(0.0, (fecha - datetime.now(timezone.utc)).total_seconds()), PAUSA_MAX)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class LimitadorHost:
+    """
+    Token bucket + concurrencia AIMD para un host, compartido por todos los workers:
+    - cada request consume un token; los tokens se recargan a `tasa` por segundo
+    - cada respuesta correcta sube tasa y concurrencia: rápido mientras el host
+      nunca se quejó (arranque) y de forma aditiva después del primer 429/503
+    - un 429/503 las reduce a la mitad y pausa el host entero durante el
+      Retry-After indicado (o un backoff exponencial si no viene)
+    """
+
+    def __init__(self, tasa_max=TASA_MAX):
+        self.tasa_max = tasa_max
+        self.tasa = min(TASA_INICIAL, tasa_max)
+        self.tokens = 1.0
+        self.concurrencia = float(CONCURRENCIA_INICIAL)
+        self.en_vuelo = 0
+        self.pausado_hasta = 0.0
+        self.fallos_seguidos = 0
+        self.en_arranque = True
+        self._ultima_recarga = time.monotonic()
+        self._lock = threading.Lock()
+
+    def ajustar_tasa_max(self, tasa_max):
+        """Tope de tasa impuesto desde fuera (p.ej. Crawl-delay de robots.txt)"""
+        with self._lock:
+            self.tasa_max = tasa_max
+            self.tasa = min(self.tasa, tasa_max)
+
+    def intentar(self):
+        """Toma un turno si hay token y hueco de concurrencia; si no, devuelve los segundos a esperar"""
+        with self._lock:
+            ahora = time.monotonic()
+            if ahora < self.pausado_hasta:
+                return self.pausado_hasta - ahora
+            if self.en_vuelo >= int(self.concurrencia):
+                return 0.05
+            # La ráfaga máxima es un segundo de tasa (al menos un request)
+            self.tokens = min(max(1.0, self.tasa), self.tokens + (ahora - self._ultima_recarga) * self.tasa)
+            self._ultima_recarga = ahora
+            if self.tokens < 1.0:
+                return (1.0 - self.tokens) / self.tasa
+            self.tokens -= 1.0
+            self.en_vuelo += 1
+            return 0.0
+
+    def adquirir(self):
+        while True:
+            espera = self.intentar()
+            if espera <= 0:
+                return
+            time.sleep(min(espera, 1.0))
+
+    async def adquirir_async(self):
+        while True:
+            espera = self.intentar()
+            if espera <= 0:
+                return
+            await asyncio.sleep(min(espera, 1.0))
+
+    def liberar(self, status=None, retry_after=None):
+        """Devuelve el turno e informa el resultado (status None = error de red o timeout)"""
+        with self._lock:
+            self.en_vuelo = max(0, self.en_vuelo - 1)
+            if status in (429, 503):
+                self.en_arranque = False
+                self.fallos_seguidos += 1
+                self.concurrencia = max(1.0, self.concurrencia / 2)
+                self.tasa = max(TASA_MIN, self.tasa / 2)
+                pausa = parse_retry_after(retry_after)
+                if pausa is None:
+                    pausa = min(PAUSA_MAX, PAUSA_BASE * 2 ** (self.fallos_seguidos - 1))
+                self.pausado_hasta = max(self.pausado_hasta, time.monotonic() + pausa)
+            elif status is None:
+                # Un timeout suele indicar saturación: menos concurrencia, sin pausar el host
+                self.concurrencia = max(1.0, self.concurrencia / 2)
+            else:
+                self.fallos_seguidos = 0
+                if self.en_arranque:
+                    self.concurrencia = min(CONCURRENCIA_MAX, self.concurrencia + 0.5)
+                    self.tasa = min(self.tasa_max, self.tasa + 0.5)
+                else:
+                    self.concurrencia = min(CONCURRENCIA_MAX, self.concurrencia + 1.0 / self.concurrencia)
+                    self.tasa = min(self.tasa_max, self.tasa + 1.0 / self.tasa)
+
+
+_limitadores = {}
+_lock = threading.Lock()
+
+
+def limitador_para(url, crawl_delay=None):
+    """Limitador compartido del host de la URL; con crawl_delay la tasa queda topada a 1/delay"""
+    host = urlparse(url).netloc.lower()
+    with _lock:
+        limitador = _limitadores.get(host)
+        if limitador is None:
+            limitador = _limitadores[host] = LimitadorHost()
+    if crawl_delay and limitador.tasa_max > 1.0 / crawl_delay:
+        limitador.ajustar_tasa_max(1.0 / crawl_delay)
+    return limitador
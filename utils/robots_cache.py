@@ -0,0 +1,110 @@
+# utils/robots_cache.py
+import threading
+import time
+import urllib.robotparser as urobot
+from urllib.parse import urlparse
+
+import requests
+
+from utils.http_client import obtener_sesion
+
+# Segundos que un robots.txt descargado se considera vigente
+ROBOTS_TTL = 3600
+# Caché negativa: hosts cuyo robots.txt falló se reintentan tras este plazo
+ROBOTS_TTL_FALLO = 600
+
+
+class RobotsCache:
+    """
+    Caché de robots.txt compartida por todo el proceso, indexada por esquema+host.
+    Cada robots.txt se descarga una sola vez por ventana de TTL; si la descarga
+    falla se guarda una entrada negativa (se permite todo) con un TTL más corto.
+    """
+
+    def __init__(self, ttl=ROBOTS_TTL, ttl_fallo=ROBOTS_TTL_FALLO, timeout=10):
+        self.ttl = ttl
+        self.ttl_fallo = ttl_fallo
+        self.timeout = timeout
+        self._entradas = {}      # origen -> (RobotFileParser | None, expira)
+        self._locks_host = {}    # origen -> Lock (evita descargas duplicadas)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _origen(url):
+        p = urlparse(url)
+        return f"{p.scheme}://{p.netloc}".lower()
+
+    def _lock_de(self, origen):
+        with self._lock:
+            lock = self._locks_host.get(origen)
+            if lock is None:
+                lock = self._locks_host[origen] = threading.Lock()
+            return lock
+
+    def _descargar(self, origen, user_agent):
+        """Descarga y parsea robots.txt; devuelve (parser | None, ttl)"""
+        robots_url = f"{origen}/robots.txt"
+        try:
+            r = obtener_sesion().get(robots_url, headers={"User-Agent": user_agent}, timeout=self.timeout)
+        except requests.RequestException:
+            return None, self.ttl_fallo
+
+        if r.status_code >= 500:
+            return None, self.ttl_fallo
+
+        rp = urobot.RobotFileParser()
+        rp.set_url(robots_url)
+        if r.status_code in (401, 403):
+            rp.disallow_all = True
+        elif r.status_code >= 400:
+            rp.allow_all = True
+        else:
+            rp.parse(r.text.splitlines())
+        return rp, self.ttl
+
+    def _parser(self, url, user_agent):
+        origen = self._origen(url)
+        entrada = self._entradas.get(origen)
+        if entrada and entrada[1] > time.time():
+            return entrada[0]
+
+        # Un solo hilo descarga el robots.txt de cada host; el resto espera el resultado
+        with self._lock_de(origen):
+            entrada = self._entradas.get(origen)
+            if entrada and entrada[1] > time.time():
+                return entrada[0]
+            rp, ttl = self._descargar(origen, user_agent)
+            self._entradas[origen] = (rp, time.time() + ttl)
+            return rp
+
+    def permitido(self, url, user_agent):
+        """True si robots.txt permite descargar la URL (o si no pudo obtenerse)"""
+        try:
+            rp = self._parser(url, user_agent)
+            return True if rp is None else rp.can_fetch(user_agent, url)
+        except Exception:
+            return True
+
+    def crawl_delay(self, url, user_agent):
+        """Segundos entre requests que pide el host (Crawl-delay o Request-rate)"""
+        try:
+            rp = self._parser(url, user_agent)
+        except Exception:
+            return None
+        if rp is None:
+            return None
+        delay = rp.crawl_delay(user_agent)
+        if delay:
+            return float(delay)
+        rate = rp.request_rate(user_agent)
+        if rate and rate.requests:
+            return rate.seconds / rate.requests
+        return None
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+
+
+# Instancia única del proceso (Streamlit reutiliza los módulos entre reruns)
+robots_cache = RobotsCache()
@@ -0,0 +1,107 @@
+# utils/similitud.py - Firma MinHash del texto de una noticia para detectar la misma historia en varias fuentes
+import re
+import unicodedata
+from hashlib import blake2b
+
+import numpy as np
+
+# Palabras por teja (shingle): 3 palabras seguidas
+TAM_TEJA = 3
+# Menos palabras que esto no da una firma fiable (notas de una línea, galerías)
+MIN_PALABRAS = 40
+# Funciones hash de la firma: 64 x 4 bytes = 256 bytes por noticia en SCRAP.minhash
+PERMUTACIONES = 64
+# Índice LSH: BANDAS x FILAS = PERMUTACIONES. Dos textos con Jaccard s comparten
+# alguna banda con probabilidad 1 - (1 - s^FILAS)^BANDAS (~0.5 es el punto de corte)
+BANDAS = 16
+FILAS = PERMUTACIONES // BANDAS
+# Parecido (Jaccard estimado de las tejas) desde el que es la misma historia
+MIN_PARECIDO = 0.5
+BYTES_FIRMA = PERMUTACIONES * 4
+
+_PRIMO = (1 << 31) - 1
+_RE_PALABRA = re.compile(r"\w+")
+
+
+def _coeficientes(nombre):
+    """Coeficientes fijos derivados de un hash: la firma no cambia entre procesos ni versiones"""
+    return np.array(
+        [int.from_bytes(blake2b(f"{nombre}{i}".encode(), digest_size=4).digest(), "big") % _PRIMO or 1
+         for i in range(PERMUTACIONES)],
+        dtype=np.uint64,
+    )
+
+
+_A = _coeficientes("a")
+_B = _coeficientes("b")
+
+
+def _palabras(texto):
+    """Minúsculas y sin tildes: "Perú" y "Peru" cuentan igual"""
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return _RE_PALABRA.findall(texto)
+
+
+def firma(texto):
+    """Firma MinHash (bytes, BYTES_FIRMA) de las tejas del texto, o None si es demasiado corto"""
+    palabras = _palabras(texto or "")
+    if len(palabras) < MIN_PALABRAS:
+        return None
+    tejas = {" ".join(palabras[i:i + TAM_TEJA]) for i in range(len(palabras) - TAM_TEJA + 1)}
+    hashes = np.frombuffer(
+        b"".join(blake2b(t.encode("utf-8"), digest_size=4).digest() for t in tejas), dtype=">u4"
+    ).astype(np.uint64)
+    # (a * x + b) mod p para cada permutación y cada teja; a, x < 2^32 no desborda uint64
+    valores = (np.outer(_A, hashes) + _B[:, None]) % _PRIMO
+    return valores.min(axis=1).astype(">u4").tobytes()
+
+
+def parecido(a, b):
+    """Jaccard estimado entre dos firmas (fracción de permutaciones con el mismo mínimo)"""
+    return float(np.mean(np.frombuffer(a, dtype=">u4") == np.frombuffer(b, dtype=">u4")))
+
+
+def bandas(firma_texto):
+    """[(n_banda, bytes)] para el índice LSH"""
+    paso = FILAS * 4
+    return [(i, firma_texto[i * paso:(i + 1) * paso]) for i in range(BANDAS)]
+
+
+class IndiceLSH:
+    """
+    Firmas MinHash indexadas por bandas: buscar() solo compara contra las noticias
+    que comparten alguna banda entera, no contra todas.
+    """
+
+    def __init__(self):
+        self._por_banda = {}
+        self._firmas = {}
+
+    def agregar(self, id_noticia, firma_texto, historia, fuente=None):
+        """historia: id de la noticia que representa la historia (la primera que llegó)"""
+        self._firmas[id_noticia] = (firma_texto, historia, fuente)
+        for banda in bandas(firma_texto):
+            self._por_banda.setdefault(banda, set()).add(id_noticia)
+
+    def buscar(self, firma_texto, fuente=None):
+        """
+        Historia de la noticia más parecida con parecido >= MIN_PARECIDO, o None.
+        Con fuente, no se consideran las noticias de esa misma fuente (una nota
+        corregida y vuelta a publicar por el mismo medio no es otra cobertura).
+        """
+        mejor = None
+        candidatos = set()
+        for banda in bandas(firma_texto):
+            candidatos |= self._por_banda.get(banda, set())
+        for id_noticia in candidatos:
+            otra, historia, otra_fuente = self._firmas[id_noticia]
+            if fuente and otra_fuente == fuente:
+                continue
+            p = parecido(firma_texto, otra)
+            if p >= MIN_PARECIDO and (mejor is None or p > mejor[0]):
+                mejor = (p, historia)
+        return mejor[1] if mejor else None
+
+    def __len__(self):
+        return len(self._firmas)
@@ -0,0 +1,113 @@
+# utils/sitemap_stream.py - Lectura incremental de sitemaps (sin construir el árbol completo)
+import xml.etree.ElementTree as ET
+import zlib
+from collections import namedtuple
+from datetime import datetime, timezone
+
+# Bloques en que se lee la respuesta
+TAM_BLOQUE = 64 * 1024
+
+# Resultado de leer_sitemap_remoto; headers son los de la respuesta (ETag, Last-Modified...)
+LecturaSitemap = namedtuple("LecturaSitemap", ["es_indice", "entradas", "status", "headers"])
+
+
+def parse_fecha_w3c(texto):
+    """Fecha de <lastmod> / <news:publication_date> como datetime con zona (UTC si no trae)"""
+    if not texto:
+        return None
+    t = texto.strip().replace("Z", "+00:00")
+    try:
+        dt = datetime.fromisoformat(t)
+    except ValueError:
+        try:
+            dt = datetime.strptime(t[:10], "%Y-%m-%d")
+        except ValueError:
+            return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+class LectorSitemap:
+    """
+    Parser incremental de sitemap / sitemapindex. Se le pasan bloques de bytes
+    con alimentar() y devuelve las entradas ya completas: (tipo, loc, fecha),
+    con tipo "url" o "sitemap" y fecha = news:publication_date o lastmod.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._raiz = None
+        self._profundidad = 0
+        self._loc = self._lastmod = self._publicacion = None
+        self.es_indice = False
+
+    def alimentar(self, datos):
+        self._parser.feed(datos)
+        return list(self._eventos())
+
+    def cerrar(self):
+        self._parser.close()
+        return list(self._eventos())
+
+    def _eventos(self):
+        for evento, elem in self._parser.read_events():
+            nombre = _local(elem.tag)
+            if evento == "start":
+                self._profundidad += 1
+                if self._raiz is None:
+                    self._raiz = elem
+                    self.es_indice = nombre == "sitemapindex"
+                elif self._profundidad == 2:
+                    self._loc = self._lastmod = self._publicacion = None
+                continue
+
+            self._profundidad -= 1
+            if nombre == "loc" and self._profundidad == 2:
+                # Solo el <loc> directo de <url>/<sitemap> (no image:loc, video:loc...)
+                self._loc = (elem.text or "").strip()
+            elif nombre == "lastmod" and self._profundidad == 2:
+                self._lastmod = parse_fecha_w3c(elem.text)
+            elif nombre == "publication_date":
+                self._publicacion = parse_fecha_w3c(elem.text)
+            elif self._profundidad == 1 and nombre in ("url", "sitemap"):
+                if self._loc:
+                    yield nombre, self._loc, self._publicacion or self._lastmod
+                # Libera lo ya procesado: la memoria no crece con el tamaño del sitemap
+                self._raiz.clear()
+
+
+def leer_sitemap_remoto(url, sesion, timeout=15, desde=None, aceptar=None, limite=None, cabeceras=None):
+    """
+    Descarga un sitemap en streaming y devuelve LecturaSitemap(es_indice, [(loc, fecha)], status, headers).
+    - desde: las entradas con fecha anterior se descartan (las que no traen fecha se conservan)
+    - aceptar: filtro opcional para los <loc> de tipo url
+    - limite: deja de leer al reunir ese número de urls aceptadas
+    - cabeceras: extra para el request (p.ej. If-None-Match); un 304 vuelve sin entradas
+    Soporta sitemaps .xml.gz. Un XML mal formado devuelve lo leído hasta el error.
+    """
+    lector = LectorSitemap()
+    entradas = []
+    with sesion.get(url, timeout=timeout, stream=True, headers=cabeceras) as r:
+        if r.status_code != 200:
+            return LecturaSitemap(False, [], r.status_code, r.headers)
+        descompresor = None
+        try:
+            for i, bloque in enumerate(r.iter_content(TAM_BLOQUE)):
+                if i == 0 and bloque[:2] == b"\x1f\x8b":
+                    descompresor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                if descompresor:
+                    bloque = descompresor.decompress(bloque)
+                for tipo, loc, fecha in lector.alimentar(bloque):
+                    if desde and fecha and fecha < desde:
+                        continue
+                    if tipo == "url" and aceptar and not aceptar(loc):
+                        continue
+                    entradas.append((loc, fecha))
+                if limite and not lector.es_indice and len(entradas) >= limite:
+                    break
+        except ET.ParseError:
+            pass
+    return LecturaSitemap(lector.es_indice, entradas, r.status_code, r.headers)
@@ -0,0 +1,40 @@
+# utils/texto.py - Limpieza del texto de una noticia (se hace una vez, al guardar)
+import re
+from html import unescape
+
+_RE_BLOQUES = re.compile(r"<(script|style|iframe|noscript)\b.*?</\1\s*>", re.I | re.S)
+_RE_ETIQUETA = re.compile(r"<[/!]?[a-zA-Z!][^>]*>")
+# Etiqueta sin cerrar al final (texto cortado a mitad de etiqueta: '<img src=x onerror=...')
+_RE_ETIQUETA_ABIERTA = re.compile(r"<[/!]?[a-zA-Z!][^>]*$")
+_RE_CONTROL = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+
+
+def limpiar_texto(texto):
+    """
+    Texto plano listo para mostrar: sin etiquetas (tampoco las que venían como
+    &lt;p&gt; ni una sin cerrar al final), sin el contenido de script/style, con las entidades decodificadas,
+    sin caracteres de control y con los espacios colapsados.
+    """
+    if texto is None:
+        return ""
+    texto = unescape(str(texto))
+    if "<" in texto:
+        texto = _RE_ETIQUETA.sub(" ", _RE_BLOQUES.sub(" ", texto))
+        texto = _RE_ETIQUETA_ABIERTA.sub(" ", texto)
+    return " ".join(_RE_CONTROL.sub(" ", texto).split())
+
+
+# Caracteres del extracto que muestran las tarjetas
+LARGO_EXTRACTO = 220
+# Velocidad de lectura para el tiempo estimado
+PALABRAS_POR_MINUTO = 200
+
+
+def extracto(texto, largo=LARGO_EXTRACTO):
+    """Inicio del texto limpio para las tarjetas ("..." si se corta)"""
+    return texto[:largo] + "..." if len(texto) > largo else texto
+
+
+def minutos_lectura(palabras):
+    """Minutos estimados de lectura (al menos 1 si hay texto)"""
+    return max(1, round(palabras / PALABRAS_POR_MINUTO)) if palabras else 0
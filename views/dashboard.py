@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from db.mysql_io import contar_por_dia
 
 def mostrar_dashboard_analisis(df):
     """Dashboard de análisis con visualizaciones mejoradas"""
@@ -78,12 +79,12 @@ def mostrar_dashboard_analisis(df):
     with col2:
         st.markdown("#### 📅 Tendencia Temporal")
         try:
-            df['fecha_clean'] = pd.to_datetime(df['fecha_scraping']).dt.date
-            daily_counts = df['fecha_clean'].value_counts().sort_index()
+            # Conteo por día de publicación en SQL (índice sobre fecha_publicacion)
+            daily_counts = contar_por_dia(30)
             
             fig_line = px.line(
-                x=daily_counts.index,
-                y=daily_counts.values,
+                x=daily_counts['dia'],
+                y=daily_counts['noticias'],
                 title="",
                 color_discrete_sequence=["#667eea"]
             )
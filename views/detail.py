@@ -1,7 +1,9 @@
+import html as html_lib
 import streamlit as st
 import time
 from components.notifications import mostrar_toast
 from utils.helpers import registrar_lectura
+from db.mysql_io import cargar_contenido
 
 def mostrar_detalle_noticia_mejorado(df, noticia_id):
     """Vista detalle con mejor UX y navegación"""
@@ -22,8 +24,12 @@ def mostrar_detalle_noticia_mejorado(df, noticia_id):
             del st.session_state.noticia_seleccionada
             st.rerun()
     
+    # Texto plano de la base: se escapa antes de insertarlo en el HTML
+    titulo = html_lib.escape(str(noticia['titulo']))
+    categoria = html_lib.escape(str(noticia.get('categoria') or 'General'))
+
     with col2:
-        st.markdown(f"<small>📂 {noticia.get('categoria', 'General')} > {noticia['titulo'][:50]}...</small>", unsafe_allow_html=True)
+        st.markdown(f"<small>📂 {categoria} > {html_lib.escape(str(noticia['titulo'])[:50])}...</small>", unsafe_allow_html=True)
     
     # Header de la noticia mejorado
     es_favorito = noticia_id in st.session_state.favoritos
@@ -32,13 +38,13 @@ def mostrar_detalle_noticia_mejorado(df, noticia_id):
     st.markdown(f"""
     <div class="news-card" style="margin: 2rem 0;">
         <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 1rem;">
-            <div class="category-tag">{noticia.get('categoria', 'General')}</div>
+            <div class="category-tag">{categoria}</div>
             <div style="display: flex; gap: 1rem; align-items: center;">
                 <span style="color: #6b7280; font-size: 0.9rem;">👁️ {lecturas} lecturas</span>
                 <span style="color: #6b7280; font-size: 0.9rem;">📅 {noticia.get('fecha', 'Sin fecha')[:10]}</span>
             </div>
         </div>
-        <h1 style="color: #1f2937; margin-bottom: 1.5rem; line-height: 1.2; font-size: 2rem;">{noticia['titulo']}</h1>
+        <h1 style="color: #1f2937; margin-bottom: 1.5rem; line-height: 1.2; font-size: 2rem;">{titulo}</h1>
     </div>
     """, unsafe_allow_html=True)
     
@@ -77,8 +83,8 @@ def mostrar_detalle_noticia_mejorado(df, noticia_id):
     st.markdown("---")
     st.markdown("### 📄 Contenido Completo")
     
-    # Formatear contenido en párrafos legibles
-    contenido_html = noticia['contenido'].replace('\n\n', '</p><p>').replace('\n', '<br>')
+    # Formatear contenido en párrafos legibles (el cuerpo se lee aparte: los listados no lo cargan)
+    contenido_html = html_lib.escape(cargar_contenido(noticia_id)).replace('\n\n', '</p><p>').replace('\n', '<br>')
     st.markdown(f"""
     <div style="
         font-size: 1.1rem; 
@@ -109,11 +115,11 @@ def mostrar_detalle_noticia_mejorado(df, noticia_id):
             with cols[idx]:
                 st.markdown(f"""
                 <div class="news-card" style="min-height: 250px;">
-                    <div class="category-tag">{relacionada.get('categoria', 'General')}</div>
-                    <h5 style="margin-bottom: 1rem;">{relacionada['titulo'][:60]}...</h5>
+                    <div class="category-tag">{html_lib.escape(str(relacionada.get('categoria') or 'General'))}</div>
+                    <h5 style="margin-bottom: 1rem;">{html_lib.escape(str(relacionada['titulo'])[:60])}...</h5>
                     <small style="color: #6b7280;">📅 {relacionada.get('fecha', 'Sin fecha')[:10]}</small>
                     <div style="margin-top: 1rem;">
-                        <small>{relacionada['contenido'][:80]}...</small>
+                        <small>{html_lib.escape((relacionada.get('extracto') or '')[:80])}...</small>
                     </div>
                 </div>
                 """, unsafe_allow_html=True)